@@ -5,18 +5,205 @@ Based on comprehensive research of Philadelphia Open Data APIs
 Implements the specific datasets identified for property compliance
 """
 
+import asyncio
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import os
-from datetime import datetime, timedelta
+import re
+import time
+from collections import OrderedDict, defaultdict
+from datetime import date, datetime, timedelta
 from typing import Dict, List, Optional, Any
 import logging
-from urllib.parse import urlencode
+
+# Optional dependency for the async client (pip install 'httpx[http2]')
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# Optional cachetools for the per-client response cache; a minimal
+# TTL+LRU stand-in keeps the cache working without the dependency
+try:
+    from cachetools import TTLCache
+except ImportError:
+    class TTLCache:
+        """Minimal TTL + LRU mapping used when cachetools is not installed"""
+
+        def __init__(self, maxsize: int, ttl: float):
+            self.maxsize = maxsize
+            self.ttl = ttl
+            self._data = OrderedDict()
+
+        def __contains__(self, key) -> bool:
+            entry = self._data.get(key)
+            if entry is None:
+                return False
+            if entry[0] < time.monotonic():
+                del self._data[key]
+                return False
+            return True
+
+        def __getitem__(self, key):
+            if key not in self:  # also purges an expired entry
+                raise KeyError(key)
+            self._data.move_to_end(key)
+            return self._data[key][1]
+
+        def __setitem__(self, key, value):
+            if key in self._data:
+                del self._data[key]
+            elif len(self._data) >= self.maxsize:
+                self._data.popitem(last=False)
+            self._data[key] = (time.monotonic() + self.ttl, value)
+
+# Optional Brotli support; when present we advertise `br`, which roughly
+# halves wire bytes vs gzip on these large flat-JSON payloads
+try:
+    import brotli  # noqa: F401  (urllib3/httpx pick it up transparently)
+    _ACCEPT_ENCODING = 'br, gzip, deflate'
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        _ACCEPT_ENCODING = 'br, gzip, deflate'
+    except ImportError:
+        _ACCEPT_ENCODING = 'gzip, deflate'
+
+# Optional incremental JSON parser for streaming large Carto responses
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Optional fast JSON parser; stdlib json is the fallback
+try:
+    import orjson
+
+    def _json_loads(raw: bytes):
+        return orjson.loads(raw)
+except ImportError:
+    def _json_loads(raw: bytes):
+        return json.loads(raw)
+
+# Errors the HTTP helpers recover from; everything else should surface
+_FETCH_ERRORS = (requests.RequestException, ValueError)
+if ijson is not None:
+    _FETCH_ERRORS = _FETCH_ERRORS + (ijson.JSONError,)
+if httpx is not None:
+    _FETCH_ERRORS = _FETCH_ERRORS + (httpx.HTTPError,)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Precompiled patterns for parse_boiler_device_info, built once at import
+# time so the per-permit parsing loop does not re-parse pattern strings.
+# Each category is one alternation with named groups, so classifying a
+# scope takes a single scan and match.lastgroup names the category.
+_DEVICE_RE = re.compile(
+    r'(?P<boiler>BOILER|STEAM\s+BOILER|HOT\s+WATER\s+BOILER)'
+    r'|(?P<water_heater>WATER\s+HEATER|HOT\s+WATER\s+HEATER)'
+    r'|(?P<furnace>FURNACE|HEATING\s+UNIT|WARM.?AIR\s+APPLIANCE)'
+    r'|(?P<hvac>HVAC|AIR\s+CONDITION|A/C|AC\s+UNIT|AIR\s+HANDLER)'
+    r'|(?P<heat_pump>HEAT\s+PUMP)'
+    r'|(?P<chiller>CHILLER)'
+    r'|(?P<burner>BURNER|GAS\s+BURNER|OIL\s+BURNER)'
+)
+
+# Capacity patterns (BTU, HP, Tons, etc.)
+_CAPACITY_PATTERNS = [
+    re.compile(r'(\d+(?:,\d+)*(?:\.\d+)?)\s*(BTU|BTUH|MBH|MMBTU)'),
+    re.compile(r'(\d+(?:\.\d+)?)\s*(HP|HORSEPOWER)'),
+    re.compile(r'(\d+(?:\.\d+)?)\s*(TON|TONS)'),
+    re.compile(r'(\d+(?:,\d+)*)\s*(CFM)'),
+    re.compile(r'(\d+(?:,\d+)*)\s*(KW|KILOWATT)')
+]
+
+_FUEL_RE = re.compile(
+    r'(?P<natural_gas>NATURAL\s+GAS|GAS\s+FIRED|GAS\s+BURNER)'
+    r'|(?P<oil>OIL\s+FIRED|FUEL\s+OIL|#\d\s+OIL)'
+    r'|(?P<electric>ELECTRIC|ELECTRICAL)'
+    r'|(?P<propane>PROPANE|LP\s+GAS|LPG)'
+    r'|(?P<dual_fuel>DUAL\s+FUEL|GAS/OIL)'
+)
+
+_WORK_RE = re.compile(
+    r'(?P<install>INSTALL|INSTALLATION)'
+    r'|(?P<replace>REPLACE|REPLACEMENT)'
+    r'|(?P<repair>REPAIR|FIX)'
+    r'|(?P<upgrade>UPGRADE|MODIFY)'
+    r'|(?P<maintain>MAINTAIN|SERVICE)'
+)
+
+_LOCATION_RE = re.compile(
+    r'(?P<basement>BASEMENT|CELLAR)'
+    r'|(?P<roof>ROOF|ROOFTOP)'
+    r'|(?P<mechanical_room>MECHANICAL\s+ROOM|MECH\s+ROOM|BOILER\s+ROOM)'
+    r'|(?P<exterior>EXTERIOR|OUTSIDE)'
+    r'|(?P<garage>GARAGE)'
+    r'|(?P<utility_room>UTILITY\s+ROOM)'
+)
+
+_MANUFACTURER_PATTERNS = [
+    re.compile(r'(CARRIER|TRANE|LENNOX|RHEEM|BRADFORD\s+WHITE|AO\s+SMITH|WEIL\s+MCLAIN|BUDERUS|NAVIEN|RINNAI|NORITZ)'),
+    re.compile(r'MANUFACTURER[:\s]+([A-Z][A-Z\s&]+)')
+]
+
+_MODEL_PATTERNS = [
+    re.compile(r'MODEL\s+([A-Z0-9\-]+)'),
+    re.compile(r'MODEL[:\s]+([A-Z0-9\-\s]+)')
+]
+
+def _sql_escape(value: str) -> str:
+    """
+    Escape a value for inclusion in a Carto/ArcGIS SQL string literal
+
+    Carto's SQL API has no bound-parameter support, so values are doubled-up
+    on single quotes before interpolation. Keeping the surrounding query text
+    constant also improves the server's query plan cache hit rate.
+    """
+    return str(value).replace("'", "''")
+
+def _street_address(address: str) -> str:
+    """Extract just the street address part (before comma), SQL-escaped"""
+    return _sql_escape(address.split(',')[0].strip())
+
+# Permit statuses counted as active in the boiler summary
+_ACTIVE_PERMIT_STATUSES = {'ISSUED', 'COMPLETED'}
+
+# Attributes actually consumed from the ArcGIS certification endpoints;
+# requested explicitly so the server skips the unused columns
+_CERT_OUT_FIELDS = ['OBJECTID', 'address', 'cert_type', 'status', 'expiration_date', 'issue_date']
+_CERT_SUMMARY_OUT_FIELDS = ['OBJECTID', 'address', 'cert_type', 'status', 'expiration_date']
+
+# Violation risk weights (Philadelphia-specific), hoisted so scoring does
+# not rebuild the dict per call
+_VIOLATION_RISK_WEIGHTS = {
+    'FIRE': 25,      # Fire code violations are critical
+    'STRUCTURAL': 20, # Structural issues are high risk
+    'ELECTRICAL': 15, # Electrical hazards
+    'MECHANICAL': 12, # HVAC/boiler issues
+    'PLUMBING': 8,   # Plumbing violations
+    'HOUSING': 5,    # General housing code
+    'ZONING': 3      # Zoning violations
+}
+
+# Violation statuses treated as open for scoring
+_OPEN_VIOLATION_STATUSES = {'OPEN', 'ACTIVE', 'IN VIOLATION'}
+
+# Single-pass violation risk categorization; match.lastgroup is the category
+_RISK_RE = re.compile(
+    r'(?P<FIRE>FIRE|SMOKE|ALARM|SPRINKLER|EXTINGUISHER|EGRESS|EXIT)'
+    r'|(?P<STRUCTURAL>STRUCTURAL|FACADE|FOUNDATION|BEAM|WALL|ROOF)'
+    r'|(?P<ELECTRICAL>ELECTRICAL|WIRING|OUTLET|CIRCUIT)'
+    r'|(?P<MECHANICAL>MECHANICAL|BOILER|HVAC|HEATING|VENTILATION)'
+    r'|(?P<PLUMBING>PLUMBING|WATER|PIPE|SEWER|DRAIN)'
+    r'|(?P<HOUSING>HOUSING|OCCUPANCY|MAINTENANCE|PROPERTY)'
+    r'|(?P<ZONING>ZONING|USE|PERMIT)'
+)
+
 class PhillyEnhancedDataClient:
     """
     Enhanced client for Philadelphia Open Data APIs
@@ -42,67 +229,205 @@ class PhillyEnhancedDataClient:
         
         self.app_token = app_token or os.getenv('PHILLY_APP_TOKEN')
         self.session = requests.Session()
-        
+
+        # Tune connection pooling so bursts of Carto + ArcGIS calls reuse
+        # warm connections instead of re-doing TCP+TLS handshakes, and
+        # retry transient upstream failures with backoff
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset(['GET'])
+            )
+        )
+        self.session.mount('https://', adapter)
+
+        # (connect, read) timeout applied to every API call
+        self.request_timeout = (3.05, 30)
+
+        # Short-lived cache of parsed query results; the same address tends
+        # to hit the same Carto/ArcGIS queries several times per report
+        self._cache = TTLCache(maxsize=1024, ttl=300)
+
         # Set headers
         self.session.headers.update({
             'User-Agent': 'PropplyAI/1.0 (Property Compliance Management)',
-            'Accept': 'application/json'
+            'Accept': 'application/json',
+            'Accept-Encoding': _ACCEPT_ENCODING
         })
         
         if self.app_token:
             self.session.headers.update({'X-App-Token': self.app_token})
+
+        # Both ArcGIS endpoints live on services.arcgis.com; with httpx
+        # installed their requests multiplex over one HTTP/2 connection
+        # instead of serializing on (or duplicating) HTTP/1.1 connections
+        self._http = None
+        if httpx is not None:
+            http_headers = {
+                'User-Agent': 'PropplyAI/1.0 (Property Compliance Management)',
+                'Accept': 'application/json',
+                'Accept-Encoding': _ACCEPT_ENCODING
+            }
+            if self.app_token:
+                http_headers['X-App-Token'] = self.app_token
+            http_timeout = httpx.Timeout(30.0, connect=3.05)
+            try:
+                self._http = httpx.Client(http2=True, headers=http_headers, timeout=http_timeout)
+            except ImportError:
+                # http2 extra (h2) not installed; HTTP/1.1 keep-alive still applies
+                self._http = httpx.Client(headers=http_headers, timeout=http_timeout)
     
-    def _make_carto_query(self, sql_query: str) -> List[Dict]:
+    def _make_carto_query(self, sql_query: str, use_cache: bool = True) -> List[Dict]:
         """
         Execute a SQL query against Carto API
-        
+
         Args:
             sql_query: SQL query string
-            
+            use_cache: Serve a recent identical query from the TTL cache
+
         Returns:
             List of records from the query
         """
+        if use_cache:
+            cache_key = ('carto', sql_query)
+            if cache_key in self._cache:
+                return self._cache[cache_key]
+
+        rows = list(self._iter_carto_query(sql_query))
+
+        if use_cache and rows:
+            self._cache[cache_key] = rows
+        return rows
+
+    def _iter_carto_query(self, sql_query: str):
+        """
+        Stream records from a Carto SQL query one row at a time
+
+        When ijson is installed the response body is parsed incrementally, so
+        large result sets never have to be materialized twice (raw JSON plus
+        parsed rows). Without ijson this falls back to a single parse.
+
+        Args:
+            sql_query: SQL query string
+
+        Yields:
+            Record dicts from the query
+        """
+        params = {'q': sql_query}
+
+        if ijson is None:
+            try:
+                response = self.session.get(self.carto_base_url, params=params, timeout=self.request_timeout)
+                response.raise_for_status()
+
+                data = _json_loads(response.content)
+                yield from data.get('rows', [])
+
+            except _FETCH_ERRORS:
+                logger.exception("Error executing Carto query")
+            return
+
         try:
-            params = {'q': sql_query}
-            response = self.session.get(self.carto_base_url, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
-            return data.get('rows', [])
-            
-        except Exception as e:
-            logger.error(f"Error executing Carto query: {e}")
-            return []
-    
-    def _make_arcgis_query(self, url: str, params: Dict) -> List[Dict]:
+            with self.session.get(self.carto_base_url, params=params,
+                                  timeout=self.request_timeout, stream=True) as response:
+                response.raise_for_status()
+                logger.debug(f"Carto response encoding: {response.headers.get('Content-Encoding')}")
+                # Let urllib3 undo any content encoding before ijson sees it
+                response.raw.decode_content = True
+                yield from ijson.items(response.raw, 'rows.item')
+
+        except _FETCH_ERRORS:
+            logger.exception("Error executing Carto query")
+
+    def _make_carto_batch(self, queries: Dict[str, str], use_cache: bool = True) -> Dict[str, List[Dict]]:
+        """
+        Execute several Carto SQL queries in one HTTP round-trip
+
+        Each query becomes a CTE whose rows are aggregated with json_agg, so
+        a single response carries every result set and the per-request TLS
+        and planner overhead is paid once. Sub-queries keep their own WHERE/
+        ORDER BY/LIMIT semantics.
+
+        Args:
+            queries: Mapping of result name (identifier-safe) to SQL text
+
+        Returns:
+            Mapping of each name to its list of records ([] on failure)
+        """
+        ctes = []
+        selects = []
+        for name, sql in queries.items():
+            if not re.fullmatch(r'[a-z_][a-z0-9_]*', name):
+                raise ValueError(f"Invalid batch query name: {name}")
+            ctes.append(f"q_{name} AS ({sql})")
+            selects.append(
+                f"SELECT '{name}' AS source, "
+                f"COALESCE(json_agg(q_{name}.*), '[]'::json) AS records FROM q_{name}"
+            )
+
+        batched_sql = "WITH " + ",\n".join(ctes) + "\n" + "\nUNION ALL\n".join(selects)
+
+        results = {name: [] for name in queries}
+        for row in self._make_carto_query(batched_sql, use_cache=use_cache):
+            source = row.get('source')
+            if source in results:
+                records = row.get('records') or []
+                if isinstance(records, str):
+                    records = _json_loads(records.encode())
+                results[source] = records
+        return results
+
+    def _make_arcgis_query(self, url: str, params: Dict,
+                           out_fields: Optional[List[str]] = None,
+                           use_cache: bool = True) -> List[Dict]:
         """
         Execute a query against ArcGIS REST API
-        
+
         Args:
             url: ArcGIS REST API endpoint
             params: Query parameters
-            
+            out_fields: Attributes to request; defaults to all fields
+            use_cache: Serve a recent identical query from the TTL cache
+
         Returns:
             List of features from the query
         """
+        # Add default parameters for ArcGIS; requesting only the needed
+        # columns keeps payloads (and JSON parse time) small
+        default_params = {
+            'f': 'json',
+            'outFields': ','.join(out_fields) if out_fields else '*',
+            'returnGeometry': 'false',
+            'resultRecordCount': 1000
+        }
+        default_params.update(params)
+
+        if use_cache:
+            cache_key = (url, tuple(sorted(default_params.items())))
+            if cache_key in self._cache:
+                return self._cache[cache_key]
+
         try:
-            # Add default parameters for ArcGIS
-            default_params = {
-                'f': 'json',
-                'outFields': '*',
-                'returnGeometry': 'false'
-            }
-            default_params.update(params)
-            
-            response = self.session.get(url, params=default_params)
+            if self._http is not None:
+                response = self._http.get(url, params=default_params)
+            else:
+                response = self.session.get(url, params=default_params, timeout=self.request_timeout)
             response.raise_for_status()
-            
-            data = response.json()
-            return data.get('features', [])
-            
-        except Exception as e:
-            logger.error(f"Error executing ArcGIS query: {e}")
+
+            data = _json_loads(response.content)
+            features = data.get('features', [])
+
+        except _FETCH_ERRORS:
+            logger.exception("Error executing ArcGIS query")
             return []
+
+        if use_cache and features:
+            self._cache[cache_key] = features
+        return features
     
     def get_li_building_permits(self, address: str = None, 
                                start_date: str = None, end_date: str = None,
@@ -123,49 +448,48 @@ class PhillyEnhancedDataClient:
         Returns:
             List of building permit records
         """
-        try:
-            # Build SQL query for Carto API
-            where_conditions = []
-            
-            if address:
-                # Extract just the street address part (before comma)
-                street_address = address.split(',')[0].strip()
-                where_conditions.append(f"address ILIKE '%{street_address}%'")
-            
-            if start_date:
-                where_conditions.append(f"permitissuedate >= '{start_date}'")
-            
-            if end_date:
-                where_conditions.append(f"permitissuedate <= '{end_date}'")
-            
-            if permit_type:
-                where_conditions.append(f"permittype ILIKE '%{permit_type}%'")
-            
-            where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
-            
-            sql_query = f"""
-                SELECT 
-                    permitnumber,
-                    permittype,
-                    permitissuedate,
-                    permitdescription,
-                    address,
-                    contractorname as contractor,
-                    status,
-                    permitissuedate as applicationdate,
-                    parcel_id_num as bin,
-                    opa_account_num as opa_account
-                FROM permits 
-                WHERE {where_clause}
-                ORDER BY permitissuedate DESC
-                LIMIT 1000
-            """
-            
-            return self._make_carto_query(sql_query)
-            
-        except Exception as e:
-            logger.error(f"Error getting L&I building permits: {e}")
-            return []
+        sql_query = self._build_permits_query(
+            address=address, start_date=start_date,
+            end_date=end_date, permit_type=permit_type
+        )
+        return self._make_carto_query(sql_query)
+
+    def _build_permits_query(self, address: str = None, start_date: str = None,
+                             end_date: str = None, permit_type: str = None) -> str:
+        """Build the Carto SQL query used by get_li_building_permits"""
+        where_conditions = []
+
+        if address:
+            where_conditions.append(f"address ILIKE '%{_street_address(address)}%'")
+
+        if start_date:
+            where_conditions.append(f"permitissuedate >= '{_sql_escape(start_date)}'")
+
+        if end_date:
+            where_conditions.append(f"permitissuedate <= '{_sql_escape(end_date)}'")
+
+        if permit_type:
+            where_conditions.append(f"permittype ILIKE '%{_sql_escape(permit_type)}%'")
+
+        where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
+
+        return f"""
+            SELECT
+                permitnumber,
+                permittype,
+                permitissuedate,
+                permitdescription,
+                address,
+                contractorname as contractor,
+                status,
+                permitissuedate as applicationdate,
+                parcel_id_num as bin,
+                opa_account_num as opa_account
+            FROM permits
+            WHERE {where_clause}
+            ORDER BY permitissuedate DESC
+            LIMIT 1000
+        """
     
     def get_li_code_violations(self, address: str = None, 
                               status: str = None, 
@@ -187,48 +511,48 @@ class PhillyEnhancedDataClient:
         Returns:
             List of code violation records
         """
-        try:
-            where_conditions = []
-            
-            if address:
-                # Extract just the street address part (before comma)
-                street_address = address.split(',')[0].strip()
-                where_conditions.append(f"address ILIKE '%{street_address}%'")
-            
-            if status:
-                where_conditions.append(f"violationstatus = '{status}'")
-            
-            if violation_type:
-                where_conditions.append(f"violationcodetitle ILIKE '%{violation_type}%'")
-            
-            if start_date:
-                where_conditions.append(f"violationdate >= '{start_date}'")
-            
-            where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
-            
-            sql_query = f"""
-                SELECT 
-                    violationnumber as violationid,
-                    violationdate,
-                    violationcodetitle as violationtype,
-                    violationcode as violationdescription,
-                    violationstatus as status,
-                    address,
-                    parcel_id_num as bin,
-                    opa_account_num as opa_account,
-                    caseresponsibility as inspector,
-                    violationresolutiondate as compliance_date
-                FROM violations 
-                WHERE {where_clause}
-                ORDER BY violationdate DESC
-                LIMIT 1000
-            """
-            
-            return self._make_carto_query(sql_query)
-            
-        except Exception as e:
-            logger.error(f"Error getting L&I code violations: {e}")
-            return []
+        sql_query = self._build_violations_query(
+            address=address, status=status,
+            violation_type=violation_type, start_date=start_date
+        )
+        return self._make_carto_query(sql_query)
+
+    def _build_violations_query(self, address: str = None, status: str = None,
+                                violation_type: str = None, start_date: str = None) -> str:
+        """Build the Carto SQL query used by get_li_code_violations"""
+        where_conditions = []
+
+        if address:
+            where_conditions.append(f"address ILIKE '%{_street_address(address)}%'")
+
+        if status:
+            where_conditions.append(f"violationstatus = '{_sql_escape(status)}'")
+
+        if violation_type:
+            where_conditions.append(f"violationcodetitle ILIKE '%{_sql_escape(violation_type)}%'")
+
+        if start_date:
+            where_conditions.append(f"violationdate >= '{_sql_escape(start_date)}'")
+
+        where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
+
+        return f"""
+            SELECT
+                violationnumber as violationid,
+                violationdate,
+                violationcodetitle as violationtype,
+                violationcode as violationdescription,
+                violationstatus as status,
+                address,
+                parcel_id_num as bin,
+                opa_account_num as opa_account,
+                caseresponsibility as inspector,
+                violationresolutiondate as compliance_date
+            FROM violations
+            WHERE {where_clause}
+            ORDER BY violationdate DESC
+            LIMIT 1000
+        """
     
     def get_li_building_certifications(self, address: str = None, 
                                      certification_type: str = None,
@@ -247,34 +571,38 @@ class PhillyEnhancedDataClient:
         Returns:
             List of building certification records
         """
-        try:
-            params = {}
-            
-            if address:
-                # Extract just the street address part (before comma)
-                street_address = address.split(',')[0].strip()
-                params['where'] = f"address ILIKE '%{street_address}%'"
-            
-            if certification_type:
-                if 'where' in params:
-                    params['where'] += f" AND cert_type ILIKE '%{certification_type}%'"
-                else:
-                    params['where'] = f"cert_type ILIKE '%{certification_type}%'"
-            
-            if status:
-                if 'where' in params:
-                    params['where'] += f" AND status = '{status}'"
-                else:
-                    params['where'] = f"status = '{status}'"
-            
-            features = self._make_arcgis_query(self.arcgis_building_certs_url, params)
-            
-            # Extract attributes from ArcGIS features
-            return [feature.get('attributes', {}) for feature in features]
-            
-        except Exception as e:
-            logger.error(f"Error getting L&I building certifications: {e}")
-            return []
+        params = self._build_certifications_params(
+            address=address, certification_type=certification_type, status=status
+        )
+        features = self._make_arcgis_query(
+            self.arcgis_building_certs_url, params, out_fields=_CERT_OUT_FIELDS
+        )
+
+        # Extract attributes from ArcGIS features
+        return [feature.get('attributes', {}) for feature in features]
+
+    def _build_certifications_params(self, address: str = None,
+                                     certification_type: str = None,
+                                     status: str = None) -> Dict:
+        """Build the ArcGIS query params used by get_li_building_certifications"""
+        params = {}
+
+        if address:
+            params['where'] = f"address ILIKE '%{_street_address(address)}%'"
+
+        if certification_type:
+            if 'where' in params:
+                params['where'] += f" AND cert_type ILIKE '%{_sql_escape(certification_type)}%'"
+            else:
+                params['where'] = f"cert_type ILIKE '%{_sql_escape(certification_type)}%'"
+
+        if status:
+            if 'where' in params:
+                params['where'] += f" AND status = '{_sql_escape(status)}'"
+            else:
+                params['where'] = f"status = '{_sql_escape(status)}'"
+
+        return params
     
     def get_li_building_certification_summary(self, address: str = None) -> List[Dict]:
         """
@@ -294,12 +622,13 @@ class PhillyEnhancedDataClient:
             params = {}
             
             if address:
-                # Extract just the street address part (before comma)
-                street_address = address.split(',')[0].strip()
-                params['where'] = f"address ILIKE '%{street_address}%'"
-            
-            features = self._make_arcgis_query(self.arcgis_building_certs_summary_url, params)
+                params['where'] = f"address ILIKE '%{_street_address(address)}%'"
             
+            features = self._make_arcgis_query(
+                self.arcgis_building_certs_summary_url, params,
+                out_fields=_CERT_SUMMARY_OUT_FIELDS
+            )
+
             # Extract attributes from ArcGIS features
             return [feature.get('attributes', {}) for feature in features]
             
@@ -329,15 +658,13 @@ class PhillyEnhancedDataClient:
             where_conditions = []
             
             if address:
-                # Extract just the street address part (before comma)
-                street_address = address.split(',')[0].strip()
-                where_conditions.append(f"address ILIKE '%{street_address}%'")
+                where_conditions.append(f"address ILIKE '%{_street_address(address)}%'")
             
             if investigation_type:
-                where_conditions.append(f"casetype ILIKE '%{investigation_type}%'")
+                where_conditions.append(f"casetype ILIKE '%{_sql_escape(investigation_type)}%'")
             
             if start_date:
-                where_conditions.append(f"investigationcompleted >= '{start_date}'")
+                where_conditions.append(f"investigationcompleted >= '{_sql_escape(start_date)}'")
             
             where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
             
@@ -385,9 +712,7 @@ class PhillyEnhancedDataClient:
             params = {}
             
             if address:
-                # Extract just the street address part (before comma)
-                street_address = address.split(',')[0].strip()
-                params['where'] = f"address ILIKE '%{street_address}%'"
+                params['where'] = f"address ILIKE '%{_street_address(address)}%'"
             
             # Placeholder - would need actual unsafe buildings endpoint
             logger.warning("Unsafe buildings endpoint not yet implemented")
@@ -416,9 +741,7 @@ class PhillyEnhancedDataClient:
             params = {}
             
             if address:
-                # Extract just the street address part (before comma)
-                street_address = address.split(',')[0].strip()
-                params['where'] = f"address ILIKE '%{street_address}%'"
+                params['where'] = f"address ILIKE '%{_street_address(address)}%'"
             
             # Placeholder - would need actual imminently dangerous buildings endpoint
             logger.warning("Imminently dangerous buildings endpoint not yet implemented")
@@ -438,6 +761,9 @@ class PhillyEnhancedDataClient:
         Returns:
             Dictionary with extracted boiler/mechanical device information
         """
+        scope_raw = permit_data.get('approvedscopeofwork')
+        scope_text = scope_raw.upper() if scope_raw else ''
+
         device_info = {
             'permit_number': permit_data.get('permitnumber'),
             'permit_date': permit_data.get('permitissuedate'),
@@ -451,220 +777,129 @@ class PhillyEnhancedDataClient:
             'location': None,
             'manufacturer': None,
             'model': None,
-            'raw_scope': permit_data.get('approvedscopeofwork')
+            'raw_scope': scope_raw
         }
-        
-        scope_text = permit_data.get('approvedscopeofwork', '').upper() if permit_data.get('approvedscopeofwork') else ''
-        
+
         if not scope_text:
             return device_info
-        
-        import re
-        
-        # Device type patterns
-        device_patterns = {
-            'boiler': r'BOILER|STEAM\s+BOILER|HOT\s+WATER\s+BOILER',
-            'water_heater': r'WATER\s+HEATER|HOT\s+WATER\s+HEATER',
-            'furnace': r'FURNACE|HEATING\s+UNIT|WARM.?AIR\s+APPLIANCE',
-            'hvac': r'HVAC|AIR\s+CONDITION|A/C|AC\s+UNIT|AIR\s+HANDLER',
-            'heat_pump': r'HEAT\s+PUMP',
-            'chiller': r'CHILLER',
-            'burner': r'BURNER|GAS\s+BURNER|OIL\s+BURNER'
-        }
-        
-        for device_type, pattern in device_patterns.items():
-            if re.search(pattern, scope_text):
-                device_info['device_type'] = device_type
-                break
-        
-        # Capacity patterns (BTU, HP, Tons, etc.)
-        capacity_patterns = [
-            r'(\d+(?:,\d+)*(?:\.\d+)?)\s*(BTU|BTUH|MBH|MMBTU)',
-            r'(\d+(?:\.\d+)?)\s*(HP|HORSEPOWER)',
-            r'(\d+(?:\.\d+)?)\s*(TON|TONS)',
-            r'(\d+(?:,\d+)*)\s*(CFM)',
-            r'(\d+(?:,\d+)*)\s*(KW|KILOWATT)'
-        ]
-        
-        for pattern in capacity_patterns:
-            match = re.search(pattern, scope_text)
+
+        match = _DEVICE_RE.search(scope_text)
+        if match:
+            device_info['device_type'] = match.lastgroup
+
+        for pattern in _CAPACITY_PATTERNS:
+            match = pattern.search(scope_text)
             if match:
                 capacity_value = match.group(1).replace(',', '')
                 capacity_unit = match.group(2)
                 device_info['capacity'] = f"{capacity_value} {capacity_unit}"
                 break
-        
-        # Fuel type patterns
-        fuel_patterns = {
-            'natural_gas': r'NATURAL\s+GAS|GAS\s+FIRED|GAS\s+BURNER',
-            'oil': r'OIL\s+FIRED|FUEL\s+OIL|#\d\s+OIL',
-            'electric': r'ELECTRIC|ELECTRICAL',
-            'propane': r'PROPANE|LP\s+GAS|LPG',
-            'dual_fuel': r'DUAL\s+FUEL|GAS/OIL'
-        }
-        
-        for fuel_type, pattern in fuel_patterns.items():
-            if re.search(pattern, scope_text):
-                device_info['fuel_type'] = fuel_type
-                break
-        
-        # Work type patterns
-        work_patterns = {
-            'install': r'INSTALL|INSTALLATION',
-            'replace': r'REPLACE|REPLACEMENT',
-            'repair': r'REPAIR|FIX',
-            'upgrade': r'UPGRADE|MODIFY',
-            'maintain': r'MAINTAIN|SERVICE'
-        }
-        
-        for work_type, pattern in work_patterns.items():
-            if re.search(pattern, scope_text):
-                device_info['work_type'] = work_type
-                break
-        
-        # Location patterns
-        location_patterns = {
-            'basement': r'BASEMENT|CELLAR',
-            'roof': r'ROOF|ROOFTOP',
-            'mechanical_room': r'MECHANICAL\s+ROOM|MECH\s+ROOM|BOILER\s+ROOM',
-            'exterior': r'EXTERIOR|OUTSIDE',
-            'garage': r'GARAGE',
-            'utility_room': r'UTILITY\s+ROOM'
-        }
-        
-        for location, pattern in location_patterns.items():
-            if re.search(pattern, scope_text):
-                device_info['location'] = location
-                break
-        
-        # Manufacturer patterns
-        manufacturer_patterns = [
-            r'(CARRIER|TRANE|LENNOX|RHEEM|BRADFORD\s+WHITE|AO\s+SMITH|WEIL\s+MCLAIN|BUDERUS|NAVIEN|RINNAI|NORITZ)',
-            r'MANUFACTURER[:\s]+([A-Z][A-Z\s&]+)'
-        ]
-        
-        for pattern in manufacturer_patterns:
-            match = re.search(pattern, scope_text)
+
+        match = _FUEL_RE.search(scope_text)
+        if match:
+            device_info['fuel_type'] = match.lastgroup
+
+        match = _WORK_RE.search(scope_text)
+        if match:
+            device_info['work_type'] = match.lastgroup
+
+        match = _LOCATION_RE.search(scope_text)
+        if match:
+            device_info['location'] = match.lastgroup
+
+        for pattern in _MANUFACTURER_PATTERNS:
+            match = pattern.search(scope_text)
             if match:
                 device_info['manufacturer'] = match.group(1).strip()
                 break
-        
-        # Model patterns
-        model_patterns = [
-            r'MODEL\s+([A-Z0-9\-]+)',
-            r'MODEL[:\s]+([A-Z0-9\-\s]+)'
-        ]
-        
-        for pattern in model_patterns:
-            match = re.search(pattern, scope_text)
+
+        for pattern in _MODEL_PATTERNS:
+            match = pattern.search(scope_text)
             if match:
                 device_info['model'] = match.group(1).strip()
                 break
-        
-            return device_info
+
+        return device_info
     
     def _calculate_enhanced_compliance_score(self, violations: List[Dict], permits: List[Dict], 
                                            certifications: List[Dict], cert_summary: List[Dict]) -> int:
         """
         Calculate enhanced compliance score with risk weighting and Philadelphia-specific factors
         """
-        # Violation risk weights (Philadelphia-specific)
-        violation_risk_weights = {
-            'FIRE': 25,      # Fire code violations are critical
-            'STRUCTURAL': 20, # Structural issues are high risk
-            'ELECTRICAL': 15, # Electrical hazards
-            'MECHANICAL': 12, # HVAC/boiler issues
-            'PLUMBING': 8,   # Plumbing violations
-            'HOUSING': 5,    # General housing code
-            'ZONING': 3      # Zoning violations
-        }
-        
         base_score = 100
-        
-        # Analyze violations by risk category
-        open_violations = [v for v in violations if v.get('status', '').upper() in ['OPEN', 'ACTIVE', 'IN VIOLATION']]
-        
-        for violation in open_violations:
-            violation_type = self._categorize_violation_risk(violation.get('violationtype', ''))
-            risk_weight = violation_risk_weights.get(violation_type, 5)
-            base_score -= risk_weight
-        
-        # Bonus for recent compliance activities
-        recent_permits = [p for p in permits if self._is_recent_permit(p)]
-        base_score += min(len(recent_permits) * 3, 15)  # Cap bonus at 15 points
-        
-        # Penalty for expired certifications
-        expired_certs = [c for c in certifications if self._is_expired_certification(c)]
-        base_score -= len(expired_certs) * 12
-        
-        # Bonus for active certifications
-        active_certs = [c for c in certifications if not self._is_expired_certification(c)]
-        base_score += min(len(active_certs) * 2, 10)  # Cap bonus at 10 points
-        
+        now = datetime.now()
+
+        # Deduct per open violation, weighted by risk category. Once the
+        # score is too low for the capped bonuses (at most +25) to lift it
+        # back above the floor, further deductions cannot change the result.
+        for violation in violations:
+            if (violation.get('status') or '').upper() in _OPEN_VIOLATION_STATUSES:
+                violation_type = self._categorize_violation_risk(violation.get('violationtype', ''))
+                base_score -= _VIOLATION_RISK_WEIGHTS.get(violation_type, 5)
+                if base_score <= -25:
+                    return 0
+
+        # Bonus for recent compliance activities; stop counting once the
+        # bonus saturates at 15 points
+        recent_permits = 0
+        for permit in permits:
+            if self._is_recent_permit(permit, now=now):
+                recent_permits += 1
+                if recent_permits >= 5:
+                    break
+        base_score += min(recent_permits * 3, 15)  # Cap bonus at 15 points
+
+        # Penalty for expired certifications, bonus for active ones
+        active_certs = 0
+        expired_certs = 0
+        for cert in certifications:
+            if self._is_expired_certification(cert, now=now):
+                expired_certs += 1
+            else:
+                active_certs += 1
+        base_score -= expired_certs * 12
+        base_score += min(active_certs * 2, 10)  # Cap bonus at 10 points
+
         return max(0, min(100, base_score))
     
     def _categorize_violation_risk(self, violation_description: str) -> str:
         """Categorize violation by risk level for Philadelphia L&I violations"""
         if not violation_description:
             return 'OTHER'
-        
-        description_upper = violation_description.upper()
-        
-        # Fire safety violations (highest risk)
-        if any(term in description_upper for term in ['FIRE', 'SMOKE', 'ALARM', 'SPRINKLER', 'EXTINGUISHER', 'EGRESS', 'EXIT']):
-            return 'FIRE'
-        
-        # Structural violations (high risk)
-        elif any(term in description_upper for term in ['STRUCTURAL', 'FACADE', 'FOUNDATION', 'BEAM', 'WALL', 'ROOF']):
-            return 'STRUCTURAL'
-        
-        # Electrical violations (medium-high risk)
-        elif any(term in description_upper for term in ['ELECTRICAL', 'WIRING', 'OUTLET', 'CIRCUIT']):
-            return 'ELECTRICAL'
-        
-        # Mechanical violations (medium risk)
-        elif any(term in description_upper for term in ['MECHANICAL', 'BOILER', 'HVAC', 'HEATING', 'VENTILATION']):
-            return 'MECHANICAL'
-        
-        # Plumbing violations (medium risk)
-        elif any(term in description_upper for term in ['PLUMBING', 'WATER', 'PIPE', 'SEWER', 'DRAIN']):
-            return 'PLUMBING'
-        
-        # Housing code violations (low-medium risk)
-        elif any(term in description_upper for term in ['HOUSING', 'OCCUPANCY', 'MAINTENANCE', 'PROPERTY']):
-            return 'HOUSING'
-        
-        # Zoning violations (low risk)
-        elif any(term in description_upper for term in ['ZONING', 'USE', 'PERMIT']):
-            return 'ZONING'
-        
-        else:
-            return 'OTHER'
+
+        # One pass over the description; group order keeps fire/structural
+        # terms winning over the lower-risk categories at the same position
+        match = _RISK_RE.search(violation_description.upper())
+        return match.lastgroup if match else 'OTHER'
     
-    def _is_recent_permit(self, permit: Dict) -> bool:
+    def _is_recent_permit(self, permit: Dict, now: Optional[datetime] = None) -> bool:
         """Check if permit is recent (within last 365 days)"""
-        if not permit.get('permitissuedate'):
+        date_str = permit.get('permitissuedate')
+        if not date_str:
             return False
-        
+
         try:
-            date_str = permit['permitissuedate']
-            if 'T' in date_str:
-                date_str = date_str.split('T')[0]
-            permit_date = datetime.strptime(date_str, '%Y-%m-%d')
-            return permit_date > datetime.now() - timedelta(days=365)
-        except:
+            # Slicing handles both plain dates and ISO timestamps, and
+            # fromisoformat avoids strptime's format-string interpretation
+            permit_date = date.fromisoformat(date_str[:10])
+        except (ValueError, TypeError):
             return False
-    
-    def _is_expired_certification(self, certification: Dict) -> bool:
+
+        today = (now or datetime.now()).date()
+        return permit_date > today - timedelta(days=365)
+
+    def _is_expired_certification(self, certification: Dict, now: Optional[datetime] = None) -> bool:
         """Check if certification is expired"""
-        if not certification.get('expiration_date'):
+        exp_str = certification.get('expiration_date')
+        if not exp_str:
             return False
-        
+
         try:
-            exp_date = datetime.strptime(certification['expiration_date'], '%Y-%m-%d')
-            return exp_date < datetime.now()
-        except:
+            exp_date = date.fromisoformat(exp_str[:10])
+        except (ValueError, TypeError):
             return False
+
+        return exp_date < (now or datetime.now()).date()
     
     def get_boiler_data(self, address: str = None, permit_number: str = None) -> Dict[str, Any]:
         """
@@ -680,65 +915,24 @@ class PhillyEnhancedDataClient:
         try:
             logger.info(f"Getting boiler data for: {address or permit_number}")
             
-            # Get mechanical permits
-            mechanical_permits = self.get_li_building_permits(
-                address=address, 
-                permit_type="Mechanical"
-            )
-            
-            # Parse device information from each permit
-            boiler_devices = []
-            for permit in mechanical_permits:
-                device_info = self.parse_boiler_device_info(permit)
-                if device_info['device_type']:  # Only include if we identified a device
-                    boiler_devices.append(device_info)
-            
-            # Get mechanical violations
-            mechanical_violations = self.get_li_code_violations(
-                address=address,
-                violation_type="mechanical"
-            )
+            # Get mechanical permits and violations in one Carto round-trip
+            carto_results = self._make_carto_batch({
+                'permits': self._build_permits_query(address=address, permit_type="Mechanical"),
+                'violations': self._build_violations_query(address=address, violation_type="mechanical")
+            })
+            mechanical_permits = carto_results['permits']
+            mechanical_violations = carto_results['violations']
             
             # Get building certifications (may include boiler certs)
             certifications = self.get_li_building_certifications(
                 address=address,
                 certification_type="mechanical"
             )
-            
-            # Categorize devices by type
-            devices_by_type = {}
-            for device in boiler_devices:
-                device_type = device['device_type']
-                if device_type not in devices_by_type:
-                    devices_by_type[device_type] = []
-                devices_by_type[device_type].append(device)
-            
-            # Calculate summary statistics
-            total_devices = len(boiler_devices)
-            active_permits = len([d for d in boiler_devices if d['status'] and d['status'].upper() in ['ISSUED', 'COMPLETED']])
-            recent_installations = len([d for d in boiler_devices if d['permit_date'] and d['permit_date'] >= '2020-01-01'])
-            
-            return {
-                'address': address,
-                'data_retrieved_at': datetime.now().isoformat(),
-                'summary': {
-                    'total_devices': total_devices,
-                    'active_permits': active_permits,
-                    'recent_installations': recent_installations,
-                    'device_types': list(devices_by_type.keys())
-                },
-                'devices': boiler_devices,
-                'devices_by_type': devices_by_type,
-                'mechanical_permits': mechanical_permits,
-                'mechanical_violations': mechanical_violations,
-                'certifications': certifications,
-                'compliance_status': {
-                    'total_violations': len(mechanical_violations),
-                    'open_violations': len([v for v in mechanical_violations if v.get('status', '').upper() in ['OPEN', 'ACTIVE']]),
-                    'certification_count': len(certifications)
-                }
-            }
-            
+
+            return self._build_boiler_report(
+                address, mechanical_permits, mechanical_violations, certifications
+            )
+
         except Exception as e:
             logger.error(f"Error getting boiler data: {e}")
             return {
@@ -747,6 +941,52 @@ class PhillyEnhancedDataClient:
                 'data_retrieved_at': datetime.now().isoformat()
             }
 
+    def _build_boiler_report(self, address: str, mechanical_permits: List[Dict],
+                             mechanical_violations: List[Dict],
+                             certifications: List[Dict]) -> Dict[str, Any]:
+        """Assemble the boiler data report from already-fetched records"""
+        # Parse device information from each permit
+        boiler_devices = []
+        for permit in mechanical_permits:
+            device_info = self.parse_boiler_device_info(permit)
+            if device_info['device_type']:  # Only include if we identified a device
+                boiler_devices.append(device_info)
+
+        # Categorize devices by type and tally summary stats in one pass
+        devices_by_type = defaultdict(list)
+        active_permits = 0
+        recent_installations = 0
+        for device in boiler_devices:
+            devices_by_type[device['device_type']].append(device)
+            if device['status'] and device['status'].upper() in _ACTIVE_PERMIT_STATUSES:
+                active_permits += 1
+            if device['permit_date'] and device['permit_date'] >= '2020-01-01':
+                recent_installations += 1
+
+        devices_by_type = dict(devices_by_type)
+        total_devices = len(boiler_devices)
+
+        return {
+            'address': address,
+            'data_retrieved_at': datetime.now().isoformat(),
+            'summary': {
+                'total_devices': total_devices,
+                'active_permits': active_permits,
+                'recent_installations': recent_installations,
+                'device_types': list(devices_by_type.keys())
+            },
+            'devices': boiler_devices,
+            'devices_by_type': devices_by_type,
+            'mechanical_permits': mechanical_permits,
+            'mechanical_violations': mechanical_violations,
+            'certifications': certifications,
+            'compliance_status': {
+                'total_violations': len(mechanical_violations),
+                'open_violations': len([v for v in mechanical_violations if v.get('status', '').upper() in ['OPEN', 'ACTIVE']]),
+                'certification_count': len(certifications)
+            }
+        }
+
     def get_comprehensive_property_data(self, address: str) -> Dict[str, Any]:
         """
         Get comprehensive property data from all available Philadelphia datasets
@@ -909,6 +1149,144 @@ class PhillyEnhancedDataClient:
         
         return test_results
 
+class AsyncPhillyEnhancedDataClient(PhillyEnhancedDataClient):
+    """
+    Async variant of PhillyEnhancedDataClient built on httpx
+
+    Fires the independent Carto and ArcGIS requests concurrently so the wall
+    time of multi-endpoint lookups like get_boiler_data is roughly the slowest
+    call instead of the sum of all calls. Requires the optional httpx
+    dependency (pip install 'httpx[http2]').
+    """
+
+    def __init__(self, app_token: Optional[str] = None):
+        if httpx is None:
+            raise ImportError(
+                "httpx is required for AsyncPhillyEnhancedDataClient "
+                "(pip install 'httpx[http2]')"
+            )
+
+        super().__init__(app_token=app_token)
+
+        headers = {
+            'User-Agent': 'PropplyAI/1.0 (Property Compliance Management)',
+            'Accept': 'application/json',
+            'Accept-Encoding': _ACCEPT_ENCODING
+        }
+        if self.app_token:
+            headers['X-App-Token'] = self.app_token
+
+        self._async_client = httpx.AsyncClient(
+            http2=True,
+            headers=headers,
+            limits=httpx.Limits(max_keepalive_connections=20),
+            timeout=30.0
+        )
+
+    async def aclose(self):
+        """Close the underlying httpx client"""
+        await self._async_client.aclose()
+
+    async def _make_carto_query_async(self, sql_query: str) -> List[Dict]:
+        """
+        Execute a SQL query against Carto API asynchronously
+
+        Args:
+            sql_query: SQL query string
+
+        Returns:
+            List of records from the query
+        """
+        try:
+            response = await self._async_client.get(self.carto_base_url, params={'q': sql_query})
+            response.raise_for_status()
+
+            data = _json_loads(response.content)
+            return data.get('rows', [])
+
+        except (httpx.HTTPError, ValueError):
+            logger.exception("Error executing Carto query")
+            return []
+
+    async def _make_arcgis_query_async(self, url: str, params: Dict,
+                                       out_fields: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Execute a query against ArcGIS REST API asynchronously
+
+        Args:
+            url: ArcGIS REST API endpoint
+            params: Query parameters
+            out_fields: Attributes to request; defaults to all fields
+
+        Returns:
+            List of features from the query
+        """
+        try:
+            # Add default parameters for ArcGIS; requesting only the needed
+            # columns keeps payloads (and JSON parse time) small
+            default_params = {
+                'f': 'json',
+                'outFields': ','.join(out_fields) if out_fields else '*',
+                'returnGeometry': 'false',
+                'resultRecordCount': 1000
+            }
+            default_params.update(params)
+
+            response = await self._async_client.get(url, params=default_params)
+            response.raise_for_status()
+
+            data = _json_loads(response.content)
+            return data.get('features', [])
+
+        except (httpx.HTTPError, ValueError):
+            logger.exception("Error executing ArcGIS query")
+            return []
+
+    async def get_boiler_data(self, address: str = None, permit_number: str = None) -> Dict[str, Any]:
+        """
+        Get comprehensive boiler and mechanical system data, fetching the
+        permits, violations, and certifications concurrently
+
+        Args:
+            address: Property address to search
+            permit_number: Specific permit number to search
+
+        Returns:
+            Dictionary containing boiler/mechanical system information
+        """
+        try:
+            logger.info(f"Getting boiler data for: {address or permit_number}")
+
+            permits_sql = self._build_permits_query(address=address, permit_type="Mechanical")
+            violations_sql = self._build_violations_query(address=address, violation_type="mechanical")
+            cert_params = self._build_certifications_params(address=address, certification_type="mechanical")
+
+            mechanical_permits, mechanical_violations, cert_features = await asyncio.gather(
+                self._make_carto_query_async(permits_sql),
+                self._make_carto_query_async(violations_sql),
+                self._make_arcgis_query_async(self.arcgis_building_certs_url, cert_params, out_fields=_CERT_OUT_FIELDS)
+            )
+
+            # Extract attributes from ArcGIS features
+            certifications = [feature.get('attributes', {}) for feature in cert_features]
+
+            return self._build_boiler_report(
+                address, mechanical_permits, mechanical_violations, certifications
+            )
+
+        except Exception as e:
+            logger.error(f"Error getting boiler data: {e}")
+            return {
+                'address': address,
+                'error': str(e),
+                'data_retrieved_at': datetime.now().isoformat()
+            }
+
+    def get_boiler_data_sync(self, address: str = None, permit_number: str = None) -> Dict[str, Any]:
+        """Synchronous wrapper around the async get_boiler_data"""
+        return asyncio.run(self.get_boiler_data(address=address, permit_number=permit_number))
+
+
 # Example usage and testing
 if __name__ == "__main__":
     # Test the enhanced client
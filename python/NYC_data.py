@@ -5,64 +5,160 @@ A comprehensive script to access NYC Open Data via Socrata API (SODA)
 Integrated with Propply AI system
 """
 
+import asyncio
+import functools
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
+import types
 import urllib.parse
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Union
 import time
 import logging
 
+try:
+    import aiohttp
+except ImportError:  # aiohttp is optional; the sync client works without it
+    aiohttp = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to stdlib json parsing
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; large responses are parsed in one go
+    ijson = None
+
+try:
+    import httpx
+except ImportError:  # httpx is optional; async fetches use aiohttp instead
+    httpx = None
+
+# HTTP/2 lets concurrent dataset queries share one multiplexed connection,
+# but httpx only speaks it when the h2 extra is installed
+_HTTP2_AVAILABLE = False
+if httpx is not None:
+    try:
+        import h2  # noqa: F401
+        _HTTP2_AVAILABLE = True
+    except ImportError:
+        pass
+
+# True when some async transport can back get_data_async
+ASYNC_AVAILABLE = aiohttp is not None or _HTTP2_AVAILABLE
+
+def soql_literal(value) -> str:
+    """
+    Quote a value as a SoQL string literal
+
+    SODA has no server-side bound parameters, so interpolated values must be
+    escaped by doubling single quotes. Identical queries for the same key
+    then stay byte-for-byte stable, which keeps upstream caches effective.
+    """
+    return "'" + str(value).replace("'", "''") + "'"
+
+# Transient statuses worth retrying, mirroring the sync session's Retry
+# config so both transports back off the same way when Socrata throttles
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_RETRY_TOTAL = 3
+_RETRY_BACKOFF = 0.3
+
+# Above this many records, parse the response incrementally instead of
+# holding the raw payload and the full object graph in memory at once
+STREAM_THRESHOLD = 200
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class NYCOpenDataClient:
     """Client for accessing NYC Open Data via Socrata API"""
-    
+
+    # Dataset configurations, built once at import and shared read-only
+    # across all client instances
+    DATASETS = types.MappingProxyType({
+        'hpd_violations': {
+            'id': 'wvxf-dwi5',
+            'name': 'HPD Violations',
+            'description': 'Housing Preservation & Development violations'
+        },
+        'dob_violations': {
+            'id': '3h2n-5cm9',
+            'name': 'DOB Violations',
+            'description': 'Building code compliance data'
+        },
+        'elevator_inspections': {
+            'id': 'e5aq-a4j2',
+            'name': 'Elevator Inspections',
+            'description': 'DOB NOW Elevator Compliance data'
+        },
+        'boiler_inspections': {
+            'id': '52dp-yji6',
+            'name': 'DOB NOW: Safety Boiler',
+            'description': 'DOB NOW safety data for boilers'
+        },
+        'electrical_permits': {
+            'id': 'dm9a-ab7w',
+            'name': 'DOB NOW: Electrical Permit Applications',
+            'description': 'Electrical permit applications'
+        }
+    })
+
+    # Kept as an alias so existing self.datasets lookups keep working
+    datasets = DATASETS
+
     def __init__(self, api_key_id: str = None, api_key_secret: str = None):
         """Initialize the NYC Open Data client"""
         self.base_url = "https://data.cityofnewyork.us/resource"
         self.auth = (api_key_id, api_key_secret) if api_key_id and api_key_secret else None
         self.session = requests.Session()
-        
-        # Dataset configurations
-        self.datasets = {
-            'hpd_violations': {
-                'id': 'wvxf-dwi5',
-                'name': 'HPD Violations',
-                'description': 'Housing Preservation & Development violations'
-            },
-            'dob_violations': {
-                'id': '3h2n-5cm9',
-                'name': 'DOB Violations',
-                'description': 'Building code compliance data'
-            },
-            'elevator_inspections': {
-                'id': 'e5aq-a4j2',
-                'name': 'Elevator Inspections',
-                'description': 'DOB NOW Elevator Compliance data'
-            },
-            'boiler_inspections': {
-                'id': '52dp-yji6',
-                'name': 'DOB NOW: Safety Boiler',
-                'description': 'DOB NOW safety data for boilers'
-            },
-            'electrical_permits': {
-                'id': 'dm9a-ab7w',
-                'name': 'DOB NOW: Electrical Permit Applications',
-                'description': 'Electrical permit applications'
-            }
-        }
-    
+        # Keep-alive pool sized for the parallel dataset queries, with
+        # retry/backoff so transient Socrata 5xx don't fail a report
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=10,
+            max_retries=Retry(total=3, backoff_factor=0.3,
+                              status_forcelist=[429, 500, 502, 503, 504])
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        # Socrata honors compression; ask for it explicitly so payloads
+        # travel gzipped even if a transport doesn't negotiate it by default
+        self.session.headers['Accept-Encoding'] = 'gzip, deflate'
+        self._async_session = None
+        self._async_http2 = None
+
     @classmethod
+    @functools.lru_cache(maxsize=1)
     def from_config(cls):
-        """Creates a client instance with API credentials from environment"""
+        """Creates the shared client instance with API credentials from environment
+
+        Memoized so every report reuses one client and its keep-alive
+        requests.Session instead of tearing the connection down each time.
+        """
         import os
         api_key_id = os.getenv('NYC_APP_TOKEN')
         api_key_secret = os.getenv('API_KEY_SECRET')
         return cls(api_key_id=api_key_id, api_key_secret=api_key_secret)
     
+    @staticmethod
+    def _retry_delay(attempt: int, retry_after: Optional[str]) -> float:
+        """Seconds to wait before retrying, honoring a Retry-After header
+
+        Socrata sends Retry-After on 429s; respecting it keeps us inside
+        the rate limit instead of hammering through it with blind retries.
+        """
+        if retry_after:
+            try:
+                return min(float(retry_after), 30.0)
+            except ValueError:
+                pass
+        return _RETRY_BACKOFF * (2 ** attempt)
+
     def _build_url(self, dataset_id: str, format_type: str = 'json') -> str:
         """Build the API endpoint URL"""
         return f"{self.base_url}/{dataset_id}.{format_type}"
@@ -91,15 +187,151 @@ class NYCOpenDataClient:
             params['$order'] = order
         
         try:
+            if format_type == 'json' and ijson is not None and limit > STREAM_THRESHOLD:
+                return list(self._stream_records(url, params, timeout))
+
             response = self.session.get(url, params=params, auth=self.auth, timeout=timeout)
             response.raise_for_status()
-            
+
             if format_type == 'json':
-                data = response.json()
+                if orjson is not None:
+                    data = orjson.loads(response.content)
+                else:
+                    data = response.json()
                 return data if data else []
             else:
                 return response.text
-                
+
+        except Exception as e:
+            print(f"Error fetching data from {dataset_key}: {e}")
+            return []
+
+    def _stream_records(self, url: str, params: Dict, timeout: int):
+        """Yield records one at a time from a streamed JSON response (requires ijson)"""
+        response = self.session.get(url, params=params, auth=self.auth,
+                                    timeout=timeout, stream=True)
+        response.raise_for_status()
+        # Let urllib3 gunzip the stream as ijson reads it
+        response.raw.decode_content = True
+        yield from ijson.items(response.raw, 'item')
+
+    def iter_data(self, dataset_key: str, limit: int = 1000, offset: int = 0,
+                  where: str = None, select: str = None, order: str = None):
+        """Stream records from a dataset as a generator, so callers can stop early"""
+        if dataset_key not in self.datasets:
+            raise ValueError(f"Unknown dataset: {dataset_key}")
+
+        if ijson is None:
+            # Without ijson, fall back to the buffered fetch
+            yield from self.get_data(dataset_key, limit=limit, offset=offset,
+                                     where=where, select=select, order=order)
+            return
+
+        dataset_id = self.datasets[dataset_key]['id']
+        url = self._build_url(dataset_id)
+
+        params = {
+            '$limit': limit,
+            '$offset': offset
+        }
+
+        if where:
+            params['$where'] = where
+        if select:
+            params['$select'] = select
+        if order:
+            params['$order'] = order
+
+        yield from self._stream_records(url, params, timeout=30)
+
+    async def get_data_async(self, dataset_key: str, limit: int = 1000, offset: int = 0,
+                             where: str = None, select: str = None, order: str = None,
+                             **kwargs) -> List[Dict]:
+        """Retrieve data from a specific dataset asynchronously
+
+        Prefers a single multiplexed HTTP/2 connection (httpx + h2) so
+        gathered queries share one socket; falls back to aiohttp.
+        """
+        if not ASYNC_AVAILABLE:
+            raise RuntimeError("httpx (with h2) or aiohttp is required for get_data_async")
+
+        if dataset_key not in self.datasets:
+            raise ValueError(f"Unknown dataset: {dataset_key}")
+
+        dataset_id = self.datasets[dataset_key]['id']
+        url = self._build_url(dataset_id)
+
+        params = {
+            '$limit': str(limit),
+            '$offset': str(offset)
+        }
+
+        if where:
+            params['$where'] = where
+        if select:
+            params['$select'] = select
+        if order:
+            params['$order'] = order
+
+        if _HTTP2_AVAILABLE:
+            if self._async_http2 is None or self._async_http2.is_closed:
+                self._async_http2 = httpx.AsyncClient(
+                    http2=True,
+                    timeout=30.0,
+                    auth=self.auth,
+                    limits=httpx.Limits(max_keepalive_connections=20)
+                )
+            try:
+                # The sync session gets retry/backoff from urllib3; httpx
+                # has no equivalent for response statuses, so retry here
+                for attempt in range(_RETRY_TOTAL + 1):
+                    response = await self._async_http2.get(url, params=params)
+                    if (response.status_code in _RETRY_STATUSES
+                            and attempt < _RETRY_TOTAL):
+                        await asyncio.sleep(self._retry_delay(
+                            attempt, response.headers.get('Retry-After')))
+                        continue
+                    response.raise_for_status()
+                    if orjson is not None:
+                        data = orjson.loads(response.content)
+                    else:
+                        data = response.json()
+                    return data if data else []
+
+            except Exception as e:
+                print(f"Error fetching data from {dataset_key}: {e}")
+                return []
+
+        if self._async_session is None or self._async_session.closed:
+            auth = aiohttp.BasicAuth(*self.auth) if self.auth else None
+            self._async_session = aiohttp.ClientSession(
+                auth=auth,
+                timeout=aiohttp.ClientTimeout(total=30),
+                # Cap concurrent sockets to Socrata; gathered queries reuse
+                # pooled connections instead of each opening its own
+                connector=aiohttp.TCPConnector(limit_per_host=8)
+            )
+
+        try:
+            for attempt in range(_RETRY_TOTAL + 1):
+                async with self._async_session.get(url, params=params) as response:
+                    if (response.status in _RETRY_STATUSES
+                            and attempt < _RETRY_TOTAL):
+                        delay = self._retry_delay(
+                            attempt, response.headers.get('Retry-After'))
+                    else:
+                        response.raise_for_status()
+                        data = await response.json()
+                        return data if data else []
+                await asyncio.sleep(delay)
+
         except Exception as e:
             print(f"Error fetching data from {dataset_key}: {e}")
             return []
+
+    async def close_async(self):
+        """Close any async HTTP clients that were opened"""
+        if self._async_http2 is not None and not self._async_http2.is_closed:
+            await self._async_http2.aclose()
+        if self._async_session is not None and not self._async_session.closed:
+            await self._async_session.close()
@@ -5,11 +5,31 @@ Flask API that generates comprehensive property compliance reports
 Supports: NYC and Philadelphia
 """
 
+# Monkey-patch before anything imports requests/urllib3 so every blocking
+# socket in the handlers becomes cooperative under gevent workers
+try:
+    from gevent import monkey
+    monkey.patch_all()
+except ImportError:  # gevent is optional; sync workers still function
+    pass
+
 from flask import Flask, request, jsonify
 from flask_cors import CORS
+import functools
 import os
+import re
 import sys
 
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick is optional; fall back to compiled regexes
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to Flask's jsonify
+    orjson = None
+
 # Import compliance systems
 from generate_report import get_property_identifiers, get_comprehensive_compliance_data, calculate_scores
 from generate_philly_report import generate_philly_report
@@ -18,6 +38,13 @@ from datetime import datetime
 app = Flask(__name__)
 CORS(app)  # Enable CORS for Next.js frontend
 
+def json_response(payload, status=200):
+    """Serialize an API payload, using orjson (bytes out, C speed) when available"""
+    if orjson is not None:
+        return app.response_class(orjson.dumps(payload), status=status,
+                                  mimetype='application/json')
+    return jsonify(payload), status
+
 @app.route('/health', methods=['GET'])
 def health():
     """Health check endpoint"""
@@ -27,16 +54,44 @@ def health():
         'supported_cities': ['NYC', 'Philadelphia']
     })
 
+# City indicator substrings, matched in a single pass per city rather than
+# one scan of the address per indicator
+PHILLY_INDICATORS = ('philadelphia', 'philly', ', pa')
+NYC_INDICATORS = ('new york', 'nyc', 'brooklyn', 'queens', 'bronx', 'manhattan', 'staten island', ', ny')
+
+def _build_matcher(indicators):
+    """Build a one-pass multi-pattern matcher for the given substrings"""
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for indicator in indicators:
+            automaton.add_word(indicator, indicator)
+        automaton.make_automaton()
+        return lambda text: next(automaton.iter(text), None) is not None
+    pattern = re.compile('|'.join(re.escape(indicator) for indicator in indicators))
+    return lambda text: pattern.search(text) is not None
+
+_matches_philly = _build_matcher(PHILLY_INDICATORS)
+_matches_nyc = _build_matcher(NYC_INDICATORS)
+
+@functools.lru_cache(maxsize=4096)
 def detect_city(address: str) -> str:
     """Detect city from address string"""
+    # Fast path: most addresses end in a ', PA' / ', NY' state suffix, which
+    # we can check without lowering (and scanning) the whole string
+    suffix = address[-4:].lower()
+    if suffix == ', pa':
+        return 'Philadelphia'
+    if suffix == ', ny':
+        return 'NYC'
+
     address_lower = address.lower()
 
     # Check for Philadelphia indicators
-    if any(indicator in address_lower for indicator in ['philadelphia', 'philly', ', pa']):
+    if _matches_philly(address_lower):
         return 'Philadelphia'
 
     # Check for NYC indicators
-    if any(indicator in address_lower for indicator in ['new york', 'nyc', 'brooklyn', 'queens', 'bronx', 'manhattan', 'staten island', ', ny']):
+    if _matches_nyc(address_lower):
         return 'NYC'
 
     # Default to NYC if unclear
@@ -51,7 +106,7 @@ def generate_compliance_report():
         city = data.get('city')  # Optional: can be explicitly provided
 
         if not address:
-            return jsonify({'error': 'Address is required'}), 400
+            return json_response({'error': 'Address is required'}, 400)
 
         # Auto-detect city if not provided
         if not city:
@@ -64,15 +119,15 @@ def generate_compliance_report():
             report = generate_philly_report(address)
 
             if 'error' in report:
-                return jsonify(report), 404
+                return json_response(report, 404)
 
-            return jsonify(report)
+            return json_response(report)
 
         else:  # NYC (default)
             # Get property identifiers
             identifiers = get_property_identifiers(address)
             if not identifiers or not identifiers.get('bin'):
-                return jsonify({'error': 'Property not found or BIN not available'}), 404
+                return json_response({'error': 'Property not found or BIN not available'}, 404)
 
             print(f"[Python API] Found property - BIN: {identifiers.get('bin')}", file=sys.stderr)
 
@@ -102,16 +157,16 @@ def generate_compliance_report():
             print(f"[Python API] - HPD: {scores['hpd_violations_active']}, DOB: {scores['dob_violations_active']}", file=sys.stderr)
             print(f"[Python API] - Elevators: {scores['elevator_devices']}, Boilers: {scores['boiler_devices']}, Electrical: {scores['electrical_permits']}", file=sys.stderr)
 
-            return jsonify(report)
+            return json_response(report)
 
     except Exception as e:
         print(f"[Python API] Error: {str(e)}", file=sys.stderr)
         import traceback
         traceback.print_exc()
-        return jsonify({
+        return json_response({
             'error': 'Failed to generate compliance report',
             'message': str(e)
-        }), 500
+        }, 500)
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 10000))
@@ -4,13 +4,20 @@ Philadelphia Compliance Report Generator
 Generates comprehensive compliance reports for Philadelphia properties
 """
 
+import bisect
 import sys
 import json
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from philly_data import PhillyEnhancedDataClient
 
+# Status buckets used when scoring, hoisted so membership checks are O(1)
+# frozenset lookups instead of list scans rebuilt per record
+STATUS_ACTIVE = frozenset({'OPEN', 'ACTIVE', 'IN VIOLATION'})
+ACTIVE_SET = frozenset({'ACTIVE', 'CURRENT', 'VALID'})
+EXPIRED_SET = frozenset({'EXPIRED', 'INACTIVE'})
+
 def get_philly_property_identifiers(address: str) -> Optional[Dict]:
     """
     Get Philadelphia property identifiers
@@ -38,15 +45,15 @@ def get_philly_compliance_data(address: str) -> Dict:
         property_data = client.get_comprehensive_property_data(address)
 
         return {
-            'li_permits': property_data.get('permits', {}).get('records', []),
-            'li_violations': property_data.get('violations', {}).get('records', []),
-            'li_certifications': property_data.get('certifications', {}).get('records', []),
-            'certification_summary': property_data.get('certification_summary', {}).get('records', []),
-            'li_investigations': property_data.get('investigations', {}).get('records', []),
-            'li_appeals': property_data.get('appeals', {}).get('records', []),
-            'compliance_summary': property_data.get('compliance_summary', {}),
-            'data_retrieved_at': property_data.get('data_retrieved_at'),
-            'data_period': property_data.get('data_period', 'Last 3 years')
+            'li_permits': property_data.permits.records,
+            'li_violations': property_data.violations.records,
+            'li_certifications': property_data.certifications.records,
+            'certification_summary': property_data.certification_summary.records,
+            'li_investigations': property_data.investigations.records,
+            'li_appeals': property_data.appeals.records,
+            'compliance_summary': property_data.compliance_summary,
+            'data_retrieved_at': property_data.data_retrieved_at,
+            'data_period': property_data.data_period
         }
     except Exception as e:
         print(f"Error getting Philadelphia compliance data: {e}", file=sys.stderr)
@@ -74,32 +81,33 @@ def calculate_philly_scores(compliance_data: Dict) -> Dict:
     appeals = compliance_data.get('li_appeals', [])
 
     # Count active violations (open/active status)
-    active_violations = len([
-        v for v in violations
-        if v.get('status', '').upper() in ['OPEN', 'ACTIVE', 'IN VIOLATION']
-    ])
-
-    # Count recent permits (last 2 years)
-    from datetime import datetime, timedelta
+    active_violations = sum(
+        1 for v in violations
+        if (v.get('status') or '').upper() in STATUS_ACTIVE
+    )
+
+    # Count recent permits (last 2 years). The Carto query returns permits
+    # ORDER BY permitissuedate DESC, so once reversed to ascending the
+    # cutoff position is a binary search rather than a comparison per permit.
+    # NULL dates sort first under Postgres's DESC (NULLS FIRST), which would
+    # land them at the tail of the reversed list and break its ordering, so
+    # they are dropped — a dateless permit can't be recent anyway
     two_years_ago = (datetime.now() - timedelta(days=730)).strftime('%Y-%m-%d')
-    recent_permits = len([
-        p for p in permits
-        if p.get('permitissuedate', '') >= two_years_ago
-    ])
-
-    # Count active vs expired certifications
-    active_certs = len([
-        c for c in certifications
-        if c.get('status', '').upper() in ['ACTIVE', 'CURRENT', 'VALID']
-    ])
-
-    expired_certs = len([
-        c for c in certifications
-        if c.get('status', '').upper() in ['EXPIRED', 'INACTIVE']
-    ])
+    dates_asc = [p['permitissuedate'] for p in reversed(permits)
+                 if p.get('permitissuedate')]
+    recent_permits = len(dates_asc) - bisect.bisect_left(dates_asc, two_years_ago)
+
+    # Count active vs expired certifications in one pass, uppercasing each
+    # status only once
+    active_certs = expired_certs = 0
+    for c in certifications:
+        status = (c.get('status') or '').upper()
+        active_certs += status in ACTIVE_SET
+        expired_certs += status in EXPIRED_SET
 
     # Use the pre-calculated compliance score from the client if available
-    overall_score = compliance_data.get('compliance_summary', {}).get('compliance_score', 0)
+    summary = compliance_data.get('compliance_summary')
+    overall_score = summary.compliance_score if summary else 0
 
     # If no pre-calculated score, calculate a basic one
     if overall_score == 0:
@@ -13,107 +13,92 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 # Import the comprehensive system (we'll need to save the full script)
 import asyncio
-import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional
-from NYC_data import NYCOpenDataClient
-
-def normalize_house_number(house_num):
-    """Normalize house number for comparison (e.g., '60-48' or '6048')"""
-    if not house_num:
-        return None
-    # Remove spaces, hyphens, and convert to lowercase
-    return str(house_num).replace('-', '').replace(' ', '').lower()
-
-def extract_house_number(address):
-    """Extract house number from address string"""
-    import re
-    # Match patterns like "60-48" or "6048" at the start
-    match = re.match(r'^([\d-]+)', address.strip())
-    if match:
-        return match.group(1)
-    return None
-
-def get_property_identifiers(address):
-    """Get property identifiers using NYC Planning GeoSearch API with validation"""
-    base_url = "https://geosearch.planninglabs.nyc/v2"
-    
+from NYC_data import NYCOpenDataClient, ASYNC_AVAILABLE, soql_literal
+from nyc_geosearch import get_identifiers as get_property_identifiers
+from scoring import calculate_scores
+import report_cache
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to stdlib json
+    orjson = None
+
+# Shared worker pool for fanning the per-dataset SODA strategies out in parallel
+_FETCH_POOL = ThreadPoolExecutor(max_workers=5)
+
+# count(*) queries run on their own pool: strategy tasks on _FETCH_POOL
+# submit them, and nesting both on one pool could leave every worker
+# blocked waiting on a queued count
+_COUNT_POOL = ThreadPoolExecutor(max_workers=5)
+
+def _apply_electrical_fallback(result, counts):
+    """Resolve the parallel Borough/Block electrical query against the BIN one
+
+    The block rows stand in only when the BIN query returned nothing;
+    otherwise they are discarded so neighbours on the same block never
+    inflate the property's permits or counts.
+    """
+    fallback = result.pop('_electrical_block', None)
+    fallback_count = counts.pop('_electrical_block', 0)
+    if fallback and not result.get('electrical_permits'):
+        result['electrical_permits'] = fallback
+        counts['electrical_permits'] = fallback_count
+
+async def _fetch_all_async(client, plans):
+    """Fetch every dataset's rows and count(*) concurrently on one event loop"""
+    result = {key: [] for key in plans}
+    counts = {}
+    keys = list(plans)
     try:
-        # Get multiple results to find the best match
-        params = {'text': address, 'size': 10}
-        response = requests.get(f"{base_url}/search", params=params, timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
-        if not data.get('features'):
-            return None
-        
-        # Extract house number from input address for validation
-        input_house_num = extract_house_number(address)
-        input_normalized = normalize_house_number(input_house_num)
-        
-        print(f"[Address Lookup] Input address: {address}", file=sys.stderr)
-        print(f"[Address Lookup] Extracted house number: {input_house_num} (normalized: {input_normalized})", file=sys.stderr)
-        print(f"[Address Lookup] Found {len(data['features'])} potential matches", file=sys.stderr)
-        
-        # Find the best matching feature
-        best_match = None
-        for idx, feature in enumerate(data['features']):
-            properties = feature.get('properties', {})
-            api_house_num = properties.get('housenumber', '')
-            api_normalized = normalize_house_number(api_house_num)
-            api_street = properties.get('street', '')
-            
-            print(f"[Address Lookup] Match {idx + 1}: {api_house_num} {api_street} (normalized: {api_normalized})", file=sys.stderr)
-            
-            # Check if house numbers match
-            if input_normalized and api_normalized and input_normalized == api_normalized:
-                print(f"[Address Lookup] ✓ Found exact house number match: {api_house_num} {api_street}", file=sys.stderr)
-                best_match = feature
-                break
-        
-        # If no exact match found, use first result but warn
-        if not best_match:
-            print(f"[Address Lookup] ⚠ WARNING: No exact house number match found. Using first result.", file=sys.stderr)
-            best_match = data['features'][0]
-        
-        properties = best_match.get('properties', {})
-        pad_data = properties.get('addendum', {}).get('pad', {})
-        
-        block = None
-        lot = None
-        bbl = pad_data.get('bbl')
-        if bbl and len(bbl) >= 10:
-            try:
-                block = bbl[1:6].lstrip('0')
-                lot = bbl[6:].lstrip('0')
-            except:
-                pass
-        
-        result_address = f"{properties.get('housenumber', '')} {properties.get('street', '')}".strip()
-        print(f"[Address Lookup] Final result: {result_address}, BIN: {pad_data.get('bin')}", file=sys.stderr)
-        
-        return {
-            'bin': pad_data.get('bin'),
-            'bbl': bbl,
-            'borough': properties.get('borough'),
-            'block': block,
-            'lot': lot,
-            'address': result_address
-        }
-    except Exception as e:
-        print(f"Error getting property identifiers: {e}", file=sys.stderr)
-        return None
+        rows_tasks = [
+            report_cache.cached_data_async(client, dataset, where=where_clause,
+                                           order=order, limit=50)
+            for dataset, _, where_clause, order in plans.values()
+        ]
+        count_tasks = [
+            report_cache.cached_data_async(client, dataset, where=where_clause,
+                                           select='count(*)')
+            for dataset, _, where_clause, _ in plans.values()
+        ]
+        results = await asyncio.gather(*rows_tasks, *count_tasks,
+                                       return_exceptions=True)
+
+        n = len(keys)
+        for i, key in enumerate(keys):
+            _, label, _, _ = plans[key]
+            rows = results[i]
+            if isinstance(rows, Exception):
+                print(f"{label} search failed: {rows}", file=sys.stderr)
+                continue
+            if not rows:
+                continue
+            print(f"Found {len(rows)} {label}", file=sys.stderr)
+            result[key] = rows
+
+            count = len(rows)
+            count_rows = results[n + i]
+            if not isinstance(count_rows, Exception) and count_rows:
+                try:
+                    count = int(count_rows[0]['count'])
+                except (KeyError, IndexError, ValueError, TypeError):
+                    count = len(rows)
+            counts[key] = count
+    finally:
+        await client.close_async()
+
+    _apply_electrical_fallback(result, counts)
+    result['counts'] = counts
+    return result
 
 def get_comprehensive_compliance_data(identifiers):
     """Get comprehensive compliance data using multi-key search strategies"""
     client = NYCOpenDataClient.from_config()
-    
+
     bin_num = identifiers.get('bin')
     block = identifiers.get('block')
-    lot = identifiers.get('lot')
-    bbl = identifiers.get('bbl')
-    
+
     result = {
         'hpd_violations': [],
         'dob_violations': [],
@@ -121,158 +106,170 @@ def get_comprehensive_compliance_data(identifiers):
         'boiler_data': [],
         'electrical_permits': []
     }
-    
+
     if not bin_num:
         return result
-    
-    # HPD Violations - Active only with multi-key search
-    # CRITICAL: Only use BIN or BBL - Block/Lot can match wrong borough!
-    strategies = []
-    if bin_num:
-        strategies.append(("BIN", f"bin = '{bin_num}' AND violationstatus = 'Open'"))
-    if bbl:
-        strategies.append(("BBL", f"bbl = '{bbl}' AND violationstatus = 'Open'"))
-    
-    for strategy_name, where_clause in strategies:
-        try:
-            data = client.get_data('hpd_violations', where=where_clause, limit=500)
-            if data and len(data) > 0:
-                # CRITICAL: Verify BIN matches to prevent wrong property data
-                if bin_num:
-                    data = [v for v in data if v.get('bin') == bin_num]
-                    if len(data) == 0:
-                        print(f"HPD {strategy_name} search returned data but BIN mismatch - skipping", file=sys.stderr)
-                        continue
-                result['hpd_violations'] = data
-                print(f"Found {len(data)} HPD violations using {strategy_name}", file=sys.stderr)
-                break
-        except Exception as e:
-            print(f"HPD {strategy_name} search failed: {e}", file=sys.stderr)
-            continue
-    
-    # DOB Violations - Active only with multi-key search
-    # CRITICAL: Only use BIN or BBL - Block/Lot can match wrong borough!
-    strategies = []
-    if bin_num:
-        strategies.append(("BIN", f"bin = '{bin_num}' AND violation_category LIKE '%ACTIVE%'"))
-    if bbl:
-        strategies.append(("BBL", f"bbl = '{bbl}' AND violation_category LIKE '%ACTIVE%'"))
-    
-    for strategy_name, where_clause in strategies:
-        try:
-            data = client.get_data('dob_violations', where=where_clause, limit=500)
-            if data and len(data) > 0:
-                # CRITICAL: Verify BIN matches to prevent wrong property data
-                if bin_num:
-                    data = [r for r in data if r.get('bin') == bin_num]
-                    if len(data) == 0:
-                        print(f"DOB {strategy_name} search returned data but BIN mismatch - skipping", file=sys.stderr)
-                        continue
-                result['dob_violations'] = data
-                print(f"Found {len(data)} DOB violations using {strategy_name}", file=sys.stderr)
-                break
-        except Exception as e:
-            print(f"DOB {strategy_name} search failed: {e}", file=sys.stderr)
-            continue
-    
-    # Elevator Inspections - BIN only to prevent wrong property data
-    if bin_num:
-        try:
-            data = client.get_data('elevator_inspections', where=f"bin = '{bin_num}'", limit=500)
-            if data and len(data) > 0:
-                result['elevator_data'] = data
-                print(f"Found {len(data)} elevator records using BIN", file=sys.stderr)
-        except Exception as e:
-            print(f"Elevator BIN search failed: {e}", file=sys.stderr)
-    
-    # Boiler Inspections - BIN only (dataset doesn't support other searches)
-    if bin_num:
-        try:
-            data = client.get_data('boiler_inspections', where=f"bin_number = '{bin_num}'", limit=500)
-            if data:
-                result['boiler_data'] = data
-                print(f"Found {len(data)} boiler records", file=sys.stderr)
-        except Exception as e:
-            print(f"Boiler search failed: {e}", file=sys.stderr)
-    
-    # Electrical Permits - Multi-key search
-    strategies = []
-    if bin_num:
-        strategies.append(("BIN", f"bin = '{bin_num}'"))
-    if block:
-        borough_name = identifiers.get('borough', '').upper()
-        if borough_name:
-            strategies.append(("Borough/Block", f"borough = '{borough_name}' AND block = '{block}'"))
-    
-    for strategy_name, where_clause in strategies:
+
+    bin_lit = soql_literal(bin_num)
+
+    # Every shipped HPD/DOB row had to pass a client-side bin == BIN check
+    # anyway, so the predicate lives in the SoQL query itself: the server
+    # rejects wrong-building rows instead of sending them over the wire,
+    # and no Python post-filter is needed.
+    # CRITICAL: Only filter by BIN - Block/Lot can match wrong borough!
+    hpd_where = f"bin = {bin_lit} AND violationstatus = 'Open'"
+    dob_where = f"bin = {bin_lit} AND violation_category LIKE '%ACTIVE%'"
+
+    # (dataset, log label, where clause, server order)
+    plans = {
+        'hpd_violations': ('hpd_violations', 'HPD violations', hpd_where, 'novissueddate DESC'),
+        'dob_violations': ('dob_violations', 'DOB violations', dob_where, 'issue_date DESC'),
+        'elevator_data': ('elevator_inspections', 'elevator records', f"bin = {bin_lit}", None),
+        'boiler_data': ('boiler_inspections', 'boiler records', f"bin_number = {bin_lit}", None),
+        'electrical_permits': ('electrical_permits', 'electrical permits', f"bin = {bin_lit}", None),
+    }
+
+    # Borough/Block fallback for older electrical permits filed without a
+    # BIN: fetched in parallel with the BIN query rather than after it,
+    # but only used (and counted) when the BIN query finds nothing, so
+    # same-block neighbours never mix into a building's own permits
+    borough_name = identifiers.get('borough', '').upper()
+    if block and borough_name:
+        plans['_electrical_block'] = (
+            'electrical_permits', 'electrical permits (block fallback)',
+            f"borough = {soql_literal(borough_name)} AND block = {soql_literal(block)}",
+            None)
+
+    # With an async transport available (aiohttp, or httpx over HTTP/2),
+    # all ten queries share one event loop and connection pool instead of
+    # worker threads
+    if ASYNC_AVAILABLE:
+        return asyncio.run(_fetch_all_async(client, plans))
+
+    def fetch(dataset, label, where_clause, order):
         try:
-            data = client.get_data('electrical_permits', where=where_clause, limit=500)
-            if data and len(data) > 0:
-                result['electrical_permits'] = data
-                print(f"Found {len(data)} electrical permits using {strategy_name}", file=sys.stderr)
-                break
+            # Kick the exact total off in parallel with the capped row
+            # fetch; scoring wants the count, the report ships <=50 rows
+            count_future = _COUNT_POOL.submit(
+                report_cache.cached_data, client, dataset,
+                where=where_clause, select='count(*)')
+            data = report_cache.cached_data(client, dataset, where=where_clause,
+                                            order=order, limit=50)
+            if not data:
+                return [], 0
+            print(f"Found {len(data)} {label}", file=sys.stderr)
+            try:
+                count = int(count_future.result()[0]['count'])
+            except Exception:
+                count = len(data)
+            return data, count
         except Exception as e:
-            print(f"Electrical {strategy_name} search failed: {e}", file=sys.stderr)
-            continue
-    
-    return result
+            print(f"{label} search failed: {e}", file=sys.stderr)
+            return [], 0
 
-def calculate_scores(data):
-    """Calculate compliance scores"""
-    hpd_active = len(data.get('hpd_violations', []))
-    dob_active = len(data.get('dob_violations', []))
-    
-    hpd_score = max(0, 100 - (hpd_active * 10))
-    dob_score = max(0, 100 - (dob_active * 15))
-    overall_score = (hpd_score * 0.5) + (dob_score * 0.5)
-    
-    return {
-        'hpd_score': round(hpd_score, 1),
-        'dob_score': round(dob_score, 1),
-        'overall_score': round(overall_score, 1),
-        'hpd_violations_active': hpd_active,
-        'dob_violations_active': dob_active,
-        'elevator_devices': len(data.get('elevator_data', [])),
-        'boiler_devices': len(data.get('boiler_data', [])),
-        'electrical_permits': len(data.get('electrical_permits', []))
+    futures = {
+        key: _FETCH_POOL.submit(fetch, *plan)
+        for key, plan in plans.items()
     }
 
-def main():
-    if len(sys.argv) < 2:
-        print(json.dumps({'error': 'Address required'}))
-        sys.exit(1)
-    
-    address = sys.argv[1]
-    
-    # Get property identifiers
+    counts = {}
+    for key, future in futures.items():
+        data, count = future.result()
+        result[key] = data
+        if data:
+            counts[key] = count
+
+    _apply_electrical_fallback(result, counts)
+    result['counts'] = counts
+    return result
+
+def generate_nyc_report(address):
+    """Generate a full NYC compliance report for an address"""
     identifiers = get_property_identifiers(address)
     if not identifiers or not identifiers.get('bin'):
-        print(json.dumps({'error': 'Property not found or BIN not available'}))
-        sys.exit(1)
-    
-    # Get compliance data
+        return {'error': 'Property not found or BIN not available'}
+
     compliance_data = get_comprehensive_compliance_data(identifiers)
-    
-    # Calculate scores
     scores = calculate_scores(compliance_data)
-    
-    # Build final report
-    report = {
+
+    return {
         'success': True,
         'property': identifiers,
         'scores': scores,
         'data': {
-            'hpd_violations': compliance_data['hpd_violations'][:50],
-            'dob_violations': compliance_data['dob_violations'][:50],
-            'elevator_data': compliance_data['elevator_data'][:50],
-            'boiler_data': compliance_data['boiler_data'][:50],
-            'electrical_permits': compliance_data['electrical_permits'][:50]
+            # Each list is already capped server-side via $limit
+            'hpd_violations': compliance_data['hpd_violations'],
+            'dob_violations': compliance_data['dob_violations'],
+            'elevator_data': compliance_data['elevator_data'],
+            'boiler_data': compliance_data['boiler_data'],
+            'electrical_permits': compliance_data['electrical_permits']
         },
         'generated_at': datetime.now().isoformat()
     }
-    
-    # Output JSON to stdout
-    print(json.dumps(report))
+
+def _emit(report):
+    """Write one newline-delimited JSON report to stdout and flush it"""
+    # orjson emits bytes directly at C speed; otherwise stream JSON to
+    # stdout incrementally rather than building the whole report as one string
+    if orjson is not None:
+        sys.stdout.buffer.write(orjson.dumps(report) + b'\n')
+        sys.stdout.buffer.flush()
+    else:
+        json.dump(report, sys.stdout, separators=(',', ':'))
+        sys.stdout.write('\n')
+        sys.stdout.flush()
+
+def _handle_request(request):
+    """Dispatch one {'address': ..., 'city': ...} request to a city pipeline"""
+    address = request.get('address')
+    if not address:
+        return {'error': 'Address required'}
+    city = (request.get('city') or '').lower()
+    if city in ('philadelphia', 'philly'):
+        # Imported lazily so NYC-only runs don't pay the Philly client's
+        # import cost
+        from generate_philly_report import generate_philly_report
+        return generate_philly_report(address)
+    return generate_nyc_report(address)
+
+def serve():
+    """Run as a long-lived worker: one JSON request per stdin line, one
+    JSON report per stdout line
+
+    A parent process (the Next.js backend) spawns this once and pipes
+    requests through it, amortizing interpreter startup, module imports,
+    TLS handshakes and the in-process caches across every report.
+    """
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = orjson.loads(line) if orjson is not None else json.loads(line)
+            report = _handle_request(request)
+        except Exception as e:
+            report = {'error': str(e)}
+        _emit(report)
+
+def main():
+    args = sys.argv[1:]
+    if '--no-cache' in args:
+        # Freshness-critical runs skip the on-disk response cache
+        report_cache.disable()
+        args = [a for a in args if a != '--no-cache']
+
+    if '--server' in args:
+        serve()
+        return
+
+    if not args:
+        _emit({'error': 'Address required'})
+        sys.exit(1)
+
+    report = generate_nyc_report(args[0])
+    _emit(report)
+    if 'error' in report:
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
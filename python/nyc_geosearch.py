@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+NYC Planning GeoSearch lookup shared by the report generators
+
+Both report CLIs used to carry their own copy of this logic; one module
+means the keep-alive session, on-disk cache, precompiled patterns and
+dict-indexed matching are applied once instead of drifting apart.
+"""
+
+import functools
+import logging
+import os
+import re
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import report_cache
+
+try:
+    import httpx
+except ImportError:  # httpx is optional; fall back to requests
+    httpx = None
+
+BASE_URL = "https://geosearch.planninglabs.nyc/v2"
+
+# Shared keep-alive client so repeated GeoSearch calls reuse one connection
+# (HTTP/2 when the h2 extra is installed) instead of a TLS handshake per call
+if httpx is not None:
+    try:
+        HTTP = httpx.Client(http2=True, timeout=30.0,
+                            limits=httpx.Limits(max_keepalive_connections=20))
+    except ImportError:
+        HTTP = httpx.Client(timeout=30.0,
+                            limits=httpx.Limits(max_keepalive_connections=20))
+else:
+    HTTP = None
+
+# Fallback session when httpx is absent: keep-alive plus retry/backoff so
+# transient GeoSearch 5xx don't fail the whole report
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=10, pool_maxsize=10,
+    max_retries=Retry(total=3, backoff_factor=0.3,
+                      status_forcelist=[429, 500, 502, 503, 504])))
+
+# Lookup diagnostics go through logging so disabled levels skip the
+# formatting work entirely (%-style args are only interpolated after the
+# level check); PROPPLY_DEBUG drops this module to DEBUG for the
+# per-candidate traces
+logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'INFO').upper())
+logger = logging.getLogger(__name__)
+if os.environ.get('PROPPLY_DEBUG'):
+    logger.setLevel(logging.DEBUG)
+
+# Compiled once: matched per GeoSearch feature in the validation loop
+_HOUSE_NUM_RE = re.compile(r'^([\d-]+)')
+_STRIP_TABLE = str.maketrans('', '', '- ')
+
+
+def normalize_address(address):
+    """Normalize an address for use as a cache key (lowercase, collapsed whitespace)"""
+    return ' '.join(address.lower().replace(',', ' ').replace('.', ' ').split())
+
+
+def normalize_house_number(house_num):
+    """Normalize house number for comparison (e.g., '60-48' or '6048')"""
+    if not house_num:
+        return None
+    # Strip spaces and hyphens in one translate pass, then lowercase
+    return str(house_num).translate(_STRIP_TABLE).lower()
+
+
+def extract_house_number(address):
+    """Extract house number from address string"""
+    # Match patterns like "60-48" or "6048" at the start
+    match = _HOUSE_NUM_RE.match(address.strip())
+    return match.group(1) if match else None
+
+
+def get_identifiers(address, *, validate=True, size=10):
+    """Get property identifiers for an address, memoized on the normalized form
+
+    Returns a dict with bin, bbl, borough, block, lot and the resolved
+    address, or None when GeoSearch has no match. With validate=False the
+    first feature is taken as-is, which lets callers use size=1 to save
+    GeoSearch compute when house-number validation isn't needed.
+    """
+    try:
+        # Failures raise out of the cached helper so they aren't memoized
+        return _get_identifiers_cached(normalize_address(address), validate, size)
+    except Exception as e:
+        logger.error("Error getting property identifiers: %s", e)
+        return None
+
+
+@functools.lru_cache(maxsize=4096)
+def _get_identifiers_cached(address, validate, size):
+    """Look an address up via GeoSearch, validating the house number match"""
+    # Repeat lookups for the same address are served from the on-disk cache
+    params = {'text': address, 'size': size}
+    data = report_cache.cached_get(f"{BASE_URL}/search", params,
+                                   report_cache.GEOSEARCH_TTL,
+                                   session=HTTP if HTTP is not None else _SESSION,
+                                   timeout=10)
+    if not data.get('features'):
+        return None
+
+    best_match = None
+    if validate:
+        # Extract house number from input address for validation
+        input_house_num = extract_house_number(address)
+        input_normalized = normalize_house_number(input_house_num)
+
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("[Address Lookup] Input address: %s", address)
+            logger.debug("[Address Lookup] Extracted house number: %s (normalized: %s)",
+                         input_house_num, input_normalized)
+        logger.info("[Address Lookup] Found %d potential matches", len(data['features']))
+
+        # Index features by normalized house number (first occurrence wins,
+        # matching the old linear scan) so the best match is one dict
+        # lookup, not a walk over all ten features
+        by_num = {}
+        for feature in data['features']:
+            api_normalized = normalize_house_number(
+                feature.get('properties', {}).get('housenumber'))
+            if api_normalized and api_normalized not in by_num:
+                by_num[api_normalized] = feature
+            if debug:
+                properties = feature.get('properties', {})
+                logger.debug("[Address Lookup] Candidate: %s %s (normalized: %s)",
+                             properties.get('housenumber', ''),
+                             properties.get('street', ''), api_normalized)
+
+        best_match = by_num.get(input_normalized) if input_normalized else None
+
+        # If no exact match found, use first result but warn
+        if not best_match:
+            logger.warning("[Address Lookup] No exact house number match found. Using first result.")
+
+    if not best_match:
+        best_match = data['features'][0]
+
+    properties = best_match.get('properties', {})
+    pad_data = properties.get('addendum', {}).get('pad', {})
+
+    block = None
+    lot = None
+    bbl = pad_data.get('bbl')
+    if bbl and len(bbl) >= 10:
+        try:
+            block = bbl[1:6].lstrip('0')
+            lot = bbl[6:].lstrip('0')
+        except Exception:
+            pass
+
+    result_address = f"{properties.get('housenumber', '')} {properties.get('street', '')}".strip()
+    logger.info("[Address Lookup] Final result: %s, BIN: %s",
+                result_address, pad_data.get('bin'))
+
+    return {
+        'bin': pad_data.get('bin'),
+        'bbl': bbl,
+        'borough': properties.get('borough'),
+        'block': block,
+        'lot': lot,
+        'address': result_address
+    }
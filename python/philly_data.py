@@ -5,18 +5,178 @@ Based on comprehensive research of Philadelphia Open Data APIs
 Implements the specific datasets identified for property compliance
 """
 
+import functools
 import requests
 import json
 import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 import logging
 from urllib.parse import urlencode
 
+try:
+    from cachetools import TTLCache
+except ImportError:  # cachetools is optional; caching is skipped without it
+    TTLCache = None
+
+try:
+    import pandas as pd
+except ImportError:  # pandas is optional; date filtering falls back to a loop
+    pd = None
+
+try:
+    import httpx
+except ImportError:  # httpx is optional; queries fall back to requests
+    httpx = None
+
+try:
+    import numba
+except ImportError:  # numba is optional; the score kernel runs interpreted
+    numba = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; responses fall back to stdlib json
+    orjson = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def sql_like_fragment(value) -> str:
+    """Escape a value for interpolation inside a SQL LIKE/ILIKE pattern
+
+    The Carto SQL and ArcGIS query endpoints take raw SQL with no
+    server-side bound parameters, so single quotes must be doubled before
+    a caller-supplied value is embedded in a pattern literal. Identical
+    inputs then always yield byte-identical queries, which also keeps any
+    upstream response caches effective.
+    """
+    return str(value).replace("'", "''")
+
+
+def sql_literal(value) -> str:
+    """Quote a value as a complete SQL string literal (quotes doubled)"""
+    return "'" + sql_like_fragment(value) + "'"
+
+
+# Shared worker pool for fanning out the independent per-source API calls.
+# The underlying requests.Session is backed by urllib3's thread-safe
+# connection pool, so concurrent GETs through one session are safe.
+_FETCH_POOL = ThreadPoolExecutor(max_workers=6)
+
+# Short-lived cache for comprehensive reports, keyed by normalized address.
+# Repeat requests for the same property within the TTL skip all six API calls.
+_COMPREHENSIVE_CACHE = TTLCache(maxsize=1024, ttl=3600) if TTLCache else None
+_COMPREHENSIVE_CACHE_LOCK = threading.Lock()
+
+# Statuses that mark a violation as still open. The casings L&I actually
+# emits are enumerated so rows can be tested with one .get() and a set
+# lookup, with no per-row .upper() allocation.
+OPEN_VIOLATION_STATUSES = frozenset({
+    'OPEN', 'Open', 'open',
+    'ACTIVE', 'Active', 'active',
+})
+
+# dataclass(slots=True) arrived in Python 3.10; older runtimes fall back to
+# regular dataclasses so the module still imports everywhere
+if sys.version_info >= (3, 10):
+    _report_dataclass = functools.partial(dataclass, slots=True)
+else:
+    _report_dataclass = dataclass
+
+@_report_dataclass
+class DatasetBlock:
+    """One dataset's records plus its headline counts"""
+    total: int
+    records: List[Dict]
+    recent: Optional[int] = None
+    open: Optional[int] = None
+
+@_report_dataclass
+class ComplianceSummary:
+    """Headline compliance metrics for a property"""
+    compliance_score: int
+    total_violations: int
+    open_violations: int
+    recent_permits: int
+    appeals_total: int
+    last_updated: str
+
+@_report_dataclass
+class PropertyReport:
+    """
+    Comprehensive property report
+
+    Slotted instances cost a fraction of the equivalent nested dicts per
+    report; orjson serializes dataclasses natively if one ever reaches the
+    JSON boundary directly.
+    """
+    address: str
+    data_retrieved_at: str
+    data_period: str
+    permits: DatasetBlock
+    violations: DatasetBlock
+    certifications: DatasetBlock
+    certification_summary: DatasetBlock
+    investigations: DatasetBlock
+    appeals: DatasetBlock
+    compliance_summary: Optional[ComplianceSummary] = None
+    error: Optional[str] = None
+
+def _empty_block() -> DatasetBlock:
+    return DatasetBlock(total=0, records=[])
+
+# Violation risk weights (Philadelphia-specific); built once instead of per
+# scoring call
+VIOLATION_RISK_WEIGHTS = {
+    'FIRE': 25,      # Fire code violations are critical
+    'STRUCTURAL': 20, # Structural issues are high risk
+    'ELECTRICAL': 15, # Electrical hazards
+    'MECHANICAL': 12, # HVAC/boiler issues
+    'PLUMBING': 8,   # Plumbing violations
+    'HOUSING': 5,    # General housing code
+    'ZONING': 3      # Zoning violations
+}
+
+# Statuses counted as open when scoring (broader than the report counter)
+_SCORING_OPEN_STATUSES = frozenset({'OPEN', 'ACTIVE', 'IN VIOLATION'})
+
+def _score_kernel(risk_penalty, recent_permits, expired_certs, active_certs):
+    """
+    Numeric core of the compliance score
+
+    Kept free of dicts and strings so numba can compile it; the dict- and
+    date-heavy preprocessing stays in the caller.
+    """
+    score = 100 - risk_penalty
+
+    bonus = recent_permits * 3
+    if bonus > 15:  # Cap bonus at 15 points
+        bonus = 15
+    score += bonus
+
+    score -= expired_certs * 12
+
+    bonus = active_certs * 2
+    if bonus > 10:  # Cap bonus at 10 points
+        bonus = 10
+    score += bonus
+
+    if score < 0:
+        return 0
+    if score > 100:
+        return 100
+    return score
+
+if numba is not None:
+    _score_kernel = numba.njit('int64(int64, int64, int64, int64)',
+                               cache=True)(_score_kernel)
+
 class PhillyEnhancedDataClient:
     """
     Enhanced client for Philadelphia Open Data APIs
@@ -51,6 +211,20 @@ class PhillyEnhancedDataClient:
         
         if self.app_token:
             self.session.headers.update({'X-App-Token': self.app_token})
+
+        # Prefer one multiplexed HTTP/2 connection per host for the Carto and
+        # ArcGIS queries; the requests session stays as the fallback path
+        self._http = None
+        if httpx is not None:
+            try:
+                self._http = httpx.Client(
+                    http2=True,
+                    timeout=30.0,
+                    headers=dict(self.session.headers),
+                    limits=httpx.Limits(max_keepalive_connections=20)
+                )
+            except ImportError:  # the h2 extra is not installed
+                self._http = None
     
     def _make_carto_query(self, sql_query: str) -> List[Dict]:
         """
@@ -64,10 +238,15 @@ class PhillyEnhancedDataClient:
         """
         try:
             params = {'q': sql_query}
-            response = self.session.get(self.carto_base_url, params=params)
+            client = self._http or self.session
+            response = client.get(self.carto_base_url, params=params)
             response.raise_for_status()
-            
-            data = response.json()
+
+            # orjson decodes the raw bytes at C speed when installed
+            if orjson is not None:
+                data = orjson.loads(response.content)
+            else:
+                data = response.json()
             return data.get('rows', [])
             
         except Exception as e:
@@ -93,11 +272,15 @@ class PhillyEnhancedDataClient:
                 'returnGeometry': 'false'
             }
             default_params.update(params)
-            
-            response = self.session.get(url, params=default_params)
+
+            client = self._http or self.session
+            response = client.get(url, params=default_params)
             response.raise_for_status()
-            
-            data = response.json()
+
+            if orjson is not None:
+                data = orjson.loads(response.content)
+            else:
+                data = response.json()
             return data.get('features', [])
             
         except Exception as e:
@@ -132,7 +315,7 @@ class PhillyEnhancedDataClient:
             if address:
                 # Extract just the street address part (before comma)
                 street_address = address.split(',')[0].strip()
-                where_conditions.append(f"address ILIKE '%{street_address}%'")
+                where_conditions.append(f"address ILIKE '%{sql_like_fragment(street_address)}%'")
 
             # Default to recent data only (last 'years_back' years) unless explicit dates provided
             if start_date:
@@ -146,7 +329,7 @@ class PhillyEnhancedDataClient:
                 where_conditions.append(f"permitissuedate <= '{end_date}'")
 
             if permit_type:
-                where_conditions.append(f"permittype ILIKE '%{permit_type}%'")
+                where_conditions.append(f"permittype ILIKE '%{sql_like_fragment(permit_type)}%'")
 
             where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
             
@@ -202,13 +385,13 @@ class PhillyEnhancedDataClient:
             if address:
                 # Extract just the street address part (before comma)
                 street_address = address.split(',')[0].strip()
-                where_conditions.append(f"address ILIKE '%{street_address}%'")
+                where_conditions.append(f"address ILIKE '%{sql_like_fragment(street_address)}%'")
 
             if status:
-                where_conditions.append(f"violationstatus = '{status}'")
+                where_conditions.append(f"violationstatus = {sql_literal(status)}")
 
             if violation_type:
-                where_conditions.append(f"violationcodetitle ILIKE '%{violation_type}%'")
+                where_conditions.append(f"violationcodetitle ILIKE '%{sql_like_fragment(violation_type)}%'")
 
             # Default to recent data only (last 'years_back' years) unless explicit date provided
             if start_date:
@@ -267,19 +450,19 @@ class PhillyEnhancedDataClient:
             if address:
                 # Extract just the street address part (before comma)
                 street_address = address.split(',')[0].strip()
-                params['where'] = f"address ILIKE '%{street_address}%'"
+                params['where'] = f"address ILIKE '%{sql_like_fragment(street_address)}%'"
             
             if certification_type:
                 if 'where' in params:
-                    params['where'] += f" AND cert_type ILIKE '%{certification_type}%'"
+                    params['where'] += f" AND cert_type ILIKE '%{sql_like_fragment(certification_type)}%'"
                 else:
-                    params['where'] = f"cert_type ILIKE '%{certification_type}%'"
+                    params['where'] = f"cert_type ILIKE '%{sql_like_fragment(certification_type)}%'"
             
             if status:
                 if 'where' in params:
-                    params['where'] += f" AND status = '{status}'"
+                    params['where'] += f" AND status = {sql_literal(status)}"
                 else:
-                    params['where'] = f"status = '{status}'"
+                    params['where'] = f"status = {sql_literal(status)}"
             
             features = self._make_arcgis_query(self.arcgis_building_certs_url, params)
             
@@ -310,7 +493,7 @@ class PhillyEnhancedDataClient:
             if address:
                 # Extract just the street address part (before comma)
                 street_address = address.split(',')[0].strip()
-                params['where'] = f"address ILIKE '%{street_address}%'"
+                params['where'] = f"address ILIKE '%{sql_like_fragment(street_address)}%'"
             
             features = self._make_arcgis_query(self.arcgis_building_certs_summary_url, params)
             
@@ -347,10 +530,10 @@ class PhillyEnhancedDataClient:
             if address:
                 # Extract just the street address part (before comma)
                 street_address = address.split(',')[0].strip()
-                where_conditions.append(f"address ILIKE '%{street_address}%'")
+                where_conditions.append(f"address ILIKE '%{sql_like_fragment(street_address)}%'")
 
             if investigation_type:
-                where_conditions.append(f"casetype ILIKE '%{investigation_type}%'")
+                where_conditions.append(f"casetype ILIKE '%{sql_like_fragment(investigation_type)}%'")
 
             # Default to recent data only (last 'years_back' years) unless explicit date provided
             if start_date:
@@ -408,7 +591,7 @@ class PhillyEnhancedDataClient:
             if address:
                 # Extract just the street address part (before comma)
                 street_address = address.split(',')[0].strip()
-                params['where'] = f"address ILIKE '%{street_address}%'"
+                params['where'] = f"address ILIKE '%{sql_like_fragment(street_address)}%'"
             
             # Placeholder - would need actual unsafe buildings endpoint
             logger.warning("Unsafe buildings endpoint not yet implemented")
@@ -439,7 +622,7 @@ class PhillyEnhancedDataClient:
             if address:
                 # Extract just the street address part (before comma)
                 street_address = address.split(',')[0].strip()
-                params['where'] = f"address ILIKE '%{street_address}%'"
+                params['where'] = f"address ILIKE '%{sql_like_fragment(street_address)}%'"
 
             # Placeholder - would need actual imminently dangerous buildings endpoint
             logger.warning("Imminently dangerous buildings endpoint not yet implemented")
@@ -474,10 +657,10 @@ class PhillyEnhancedDataClient:
             if address:
                 # Extract just the street address part (before comma)
                 street_address = address.split(',')[0].strip()
-                where_conditions.append(f"address ILIKE '%{street_address}%'")
+                where_conditions.append(f"address ILIKE '%{sql_like_fragment(street_address)}%'")
 
             if appeal_status:
-                where_conditions.append(f"appealstatus = '{appeal_status}'")
+                where_conditions.append(f"appealstatus = {sql_literal(appeal_status)}")
 
             # Default to recent data only (last 'years_back' years) unless explicit date provided
             if start_date:
@@ -660,40 +843,22 @@ class PhillyEnhancedDataClient:
         """
         Calculate enhanced compliance score with risk weighting and Philadelphia-specific factors
         """
-        # Violation risk weights (Philadelphia-specific)
-        violation_risk_weights = {
-            'FIRE': 25,      # Fire code violations are critical
-            'STRUCTURAL': 20, # Structural issues are high risk
-            'ELECTRICAL': 15, # Electrical hazards
-            'MECHANICAL': 12, # HVAC/boiler issues
-            'PLUMBING': 8,   # Plumbing violations
-            'HOUSING': 5,    # General housing code
-            'ZONING': 3      # Zoning violations
-        }
-        
-        base_score = 100
-        
-        # Analyze violations by risk category
-        open_violations = [v for v in violations if v.get('status', '').upper() in ['OPEN', 'ACTIVE', 'IN VIOLATION']]
-        
-        for violation in open_violations:
-            violation_type = self._categorize_violation_risk(violation.get('violationtype', ''))
-            risk_weight = violation_risk_weights.get(violation_type, 5)
-            base_score -= risk_weight
-        
-        # Bonus for recent compliance activities
-        recent_permits = [p for p in permits if self._is_recent_permit(p)]
-        base_score += min(len(recent_permits) * 3, 15)  # Cap bonus at 15 points
-        
-        # Penalty for expired certifications
-        expired_certs = [c for c in certifications if self._is_expired_certification(c)]
-        base_score -= len(expired_certs) * 12
-        
-        # Bonus for active certifications
-        active_certs = [c for c in certifications if not self._is_expired_certification(c)]
-        base_score += min(len(active_certs) * 2, 10)  # Cap bonus at 10 points
-        
-        return max(0, min(100, base_score))
+        # Analyze open violations by risk category
+        risk_penalty = 0
+        for violation in violations:
+            if violation.get('status', '').upper() in _SCORING_OPEN_STATUSES:
+                violation_type = self._categorize_violation_risk(violation.get('violationtype', ''))
+                risk_penalty += VIOLATION_RISK_WEIGHTS.get(violation_type, 5)
+
+        # Recent compliance activity
+        recent_permit_count = sum(1 for p in permits if self._is_recent_permit(p))
+
+        # Expired vs active certifications, classified once per record
+        expired_cert_count = sum(1 for c in certifications if self._is_expired_certification(c))
+        active_cert_count = len(certifications) - expired_cert_count
+
+        return int(_score_kernel(risk_penalty, recent_permit_count,
+                                 expired_cert_count, active_cert_count))
     
     def _categorize_violation_risk(self, violation_description: str) -> str:
         """Categorize violation by risk level for Philadelphia L&I violations"""
@@ -839,7 +1004,7 @@ class PhillyEnhancedDataClient:
                 'data_retrieved_at': datetime.now().isoformat()
             }
 
-    def get_comprehensive_property_data(self, address: str, years_back: int = 3) -> Dict[str, Any]:
+    def get_comprehensive_property_data(self, address: str, years_back: int = 3) -> PropertyReport:
         """
         Get comprehensive property data from all available Philadelphia datasets (recent data only)
 
@@ -848,40 +1013,82 @@ class PhillyEnhancedDataClient:
             years_back: Number of years of history to retrieve (default: 3)
 
         Returns:
-            Dictionary containing all available data for the property from the last 'years_back' years
+            PropertyReport with all available data for the property from the last 'years_back' years
         """
+        cache_key = (' '.join(address.lower().split()), years_back)
+        if _COMPREHENSIVE_CACHE is not None:
+            with _COMPREHENSIVE_CACHE_LOCK:
+                cached = _COMPREHENSIVE_CACHE.get(cache_key)
+            if cached is not None:
+                return cached
+
+        # Timestamp once per invocation; every block below reuses these
+        now = datetime.now()
+        now_iso = now.isoformat()
+
         try:
             logger.info(f"Getting comprehensive data for: {address} (last {years_back} years)")
 
-            # Get data from all available sources - all with date filtering
-            permits = self.get_li_building_permits(address, years_back=years_back)
-            violations = self.get_li_code_violations(address, years_back=years_back)
-            certifications = self.get_li_building_certifications(address)  # Already filtered by status
-            certification_summary = self.get_li_building_certification_summary(address)
-            investigations = self.get_li_case_investigations(address, years_back=years_back)
-            appeals = self.get_li_appeals(address, years_back=years_back)
+            # Get data from all available sources - all with date filtering.
+            # The sources are independent HTTP endpoints, so fetch them
+            # concurrently; wall time drops to roughly the slowest call.
+            futures = {
+                'permits': _FETCH_POOL.submit(self.get_li_building_permits, address, years_back=years_back),
+                'violations': _FETCH_POOL.submit(self.get_li_code_violations, address, years_back=years_back),
+                'certifications': _FETCH_POOL.submit(self.get_li_building_certifications, address),  # Already filtered by status
+                'certification_summary': _FETCH_POOL.submit(self.get_li_building_certification_summary, address),
+                'investigations': _FETCH_POOL.submit(self.get_li_case_investigations, address, years_back=years_back),
+                'appeals': _FETCH_POOL.submit(self.get_li_appeals, address, years_back=years_back)
+            }
+
+            results = {}
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    logger.error(f"Error fetching {name}: {e}")
+                    results[name] = []
+
+            permits = results['permits']
+            violations = results['violations']
+            certifications = results['certifications']
+            certification_summary = results['certification_summary']
+            investigations = results['investigations']
+            appeals = results['appeals']
             
-            # Calculate compliance metrics
-            open_violations = [v for v in violations if v.get('status') and v.get('status').upper() in ['OPEN', 'ACTIVE']]
+            # Calculate compliance metrics in a single pass over the violations
+            total_violations = 0
+            open_violation_count = 0
+            for v in violations:
+                total_violations += 1
+                if v.get('status') in OPEN_VIOLATION_STATUSES:
+                    open_violation_count += 1
             
             # Handle date parsing for permits (they come with timestamp)
-            recent_permits = []
-            for p in permits:
-                if p.get('permitissuedate'):
+            cutoff = now - timedelta(days=365)
+            if pd is not None and permits:
+                # Parse the whole column at once; unparseable dates become NaT
+                # and fail the comparison, matching the loop's skip behavior
+                dates = pd.to_datetime(
+                    [p.get('permitissuedate') for p in permits], errors='coerce'
+                )
+                mask = dates > pd.Timestamp(cutoff)
+                recent_permits = [p for p, keep in zip(permits, mask) if keep]
+            else:
+                recent_permits = []
+                for p in permits:
+                    date_str = p.get('permitissuedate')
+                    if not date_str:
+                        continue
                     try:
                         # Handle both date and datetime formats
-                        date_str = p['permitissuedate']
-                        if 'T' in date_str:
-                            date_str = date_str.split('T')[0]  # Extract date part
-                        permit_date = datetime.strptime(date_str, '%Y-%m-%d')
-                        if permit_date > datetime.now() - timedelta(days=365):
-                            recent_permits.append(p)
-                    except:
+                        permit_date = datetime.strptime(date_str[:10], '%Y-%m-%d')
+                    except ValueError:
                         continue
+                    if permit_date > cutoff:
+                        recent_permits.append(p)
             
             # Calculate compliance score
-            total_violations = len(violations)
-            open_violation_count = len(open_violations)
             recent_permit_count = len(recent_permits)
             
             # Enhanced compliance scoring with risk weighting
@@ -889,53 +1096,67 @@ class PhillyEnhancedDataClient:
                 violations, permits, certifications, certification_summary
             )
             
-            return {
-                'address': address,
-                'data_retrieved_at': datetime.now().isoformat(),
-                'data_period': f'Last {years_back} years',
-                'permits': {
-                    'total': len(permits),
-                    'recent': recent_permit_count,
-                    'records': permits
-                },
-                'violations': {
-                    'total': total_violations,
-                    'open': open_violation_count,
-                    'records': violations
-                },
-                'certifications': {
-                    'total': len(certifications),
-                    'records': certifications
-                },
-                'certification_summary': {
-                    'total': len(certification_summary),
-                    'records': certification_summary
-                },
-                'investigations': {
-                    'total': len(investigations),
-                    'records': investigations
-                },
-                'appeals': {
-                    'total': len(appeals),
-                    'records': appeals
-                },
-                'compliance_summary': {
-                    'compliance_score': compliance_score,
-                    'total_violations': total_violations,
-                    'open_violations': open_violation_count,
-                    'recent_permits': recent_permit_count,
-                    'appeals_total': len(appeals),
-                    'last_updated': datetime.now().isoformat()
-                }
-            }
-            
+            result = PropertyReport(
+                address=address,
+                data_retrieved_at=now_iso,
+                data_period=f'Last {years_back} years',
+                permits=DatasetBlock(
+                    total=len(permits),
+                    recent=recent_permit_count,
+                    records=permits
+                ),
+                violations=DatasetBlock(
+                    total=total_violations,
+                    open=open_violation_count,
+                    records=violations
+                ),
+                certifications=DatasetBlock(
+                    total=len(certifications),
+                    records=certifications
+                ),
+                certification_summary=DatasetBlock(
+                    total=len(certification_summary),
+                    records=certification_summary
+                ),
+                investigations=DatasetBlock(
+                    total=len(investigations),
+                    records=investigations
+                ),
+                appeals=DatasetBlock(
+                    total=len(appeals),
+                    records=appeals
+                ),
+                compliance_summary=ComplianceSummary(
+                    compliance_score=compliance_score,
+                    total_violations=total_violations,
+                    open_violations=open_violation_count,
+                    recent_permits=recent_permit_count,
+                    appeals_total=len(appeals),
+                    last_updated=now_iso
+                )
+            )
+
+            # Only successful reports are cached; error payloads stay uncached
+            if _COMPREHENSIVE_CACHE is not None:
+                with _COMPREHENSIVE_CACHE_LOCK:
+                    _COMPREHENSIVE_CACHE[cache_key] = result
+
+            return result
+
         except Exception as e:
             logger.error(f"Error getting comprehensive property data: {e}")
-            return {
-                'address': address,
-                'error': str(e),
-                'data_retrieved_at': datetime.now().isoformat()
-            }
+            return PropertyReport(
+                address=address,
+                data_retrieved_at=now_iso,
+                data_period=f'Last {years_back} years',
+                permits=_empty_block(),
+                violations=_empty_block(),
+                certifications=_empty_block(),
+                certification_summary=_empty_block(),
+                investigations=_empty_block(),
+                appeals=_empty_block(),
+                error=str(e)
+            )
     
     def test_api_connectivity(self) -> Dict[str, Any]:
         """
@@ -1052,11 +1273,11 @@ if __name__ == "__main__":
     print("\nTesting comprehensive data retrieval...")
     comprehensive_data = client.get_comprehensive_property_data(test_address)
     
-    if 'error' in comprehensive_data:
-        print(f"  Error: {comprehensive_data['error']}")
+    if comprehensive_data.error:
+        print(f"  Error: {comprehensive_data.error}")
     else:
-        compliance = comprehensive_data['compliance_summary']
-        print(f"  Compliance Score: {compliance['compliance_score']}")
-        print(f"  Total Violations: {compliance['total_violations']}")
-        print(f"  Open Violations: {compliance['open_violations']}")
-        print(f"  Recent Permits: {compliance['recent_permits']}")
+        compliance = comprehensive_data.compliance_summary
+        print(f"  Compliance Score: {compliance.compliance_score}")
+        print(f"  Total Violations: {compliance.total_violations}")
+        print(f"  Open Violations: {compliance.open_violations}")
+        print(f"  Recent Permits: {compliance.recent_permits}")
@@ -5,10 +5,8 @@ Similar to NYC Open Data Client but for Philadelphia datasets
 """
 
 import requests
-import json
 import os
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional
 import logging
 
 # Configure logging
@@ -17,7 +15,18 @@ logger = logging.getLogger(__name__)
 
 class PhillyOpenDataClient:
     """Client for accessing Philadelphia Open Data APIs"""
-    
+
+    # Endpoint URL per known dataset, built once at class definition so
+    # the hot query path is a dict lookup instead of an f-string per call
+    _DATASET_URLS = {
+        dataset_id: f"https://data.phila.gov/resource/{dataset_id}.json"
+        for dataset_id in (
+            'permits', 'violations', 'property-assessments',
+            'fire-inspections', 'housing-violations', 'zoning'
+        )
+    }
+
+
     def __init__(self, app_token: Optional[str] = None):
         """
         Initialize Philadelphia Open Data client
@@ -111,9 +120,11 @@ class PhillyOpenDataClient:
             List of records from the dataset
         """
         try:
-            # Construct the Socrata API URL
-            url = f"https://data.phila.gov/resource/{dataset_id}.json"
-            
+            # Known datasets resolve via the precomputed table; anything
+            # else still gets its URL built on the fly
+            url = self._DATASET_URLS.get(dataset_id) \
+                or f"https://data.phila.gov/resource/{dataset_id}.json"
+
             params = {
                 '$limit': limit,
                 '$offset': offset
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Persistent on-disk cache for GeoSearch and Socrata responses
+
+Repeat report runs for the same address re-issue the exact same HTTP
+requests; caching the raw JSON bodies on disk turns those round trips
+into sub-millisecond local reads. Keys are a blake2b hash of the
+endpoint plus its parameters, values are the unparsed JSON text so
+revalidation stays cheap. Entries expire by TTL: GeoSearch results are
+stable for a day, violation data is kept fresh within the hour.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+import requests
+
+try:
+    import diskcache
+except ImportError:  # diskcache is optional; fall back to a stdlib sqlite3 store
+    diskcache = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to stdlib json
+    orjson = None
+
+
+def _loads(body):
+    """Parse cached/raw JSON text, preferring the C decoder when present"""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+CACHE_DIR = os.path.expanduser(os.environ.get('PROPPLY_CACHE_DIR', '~/.cache/propply'))
+
+# TTLs in seconds
+GEOSEARCH_TTL = 24 * 3600
+SODA_TTL = 3600
+
+_store = None
+_store_lock = threading.Lock()
+_disabled = False
+
+
+def disable():
+    """Bypass the cache for this process (the --no-cache CLI flag)"""
+    global _disabled
+    _disabled = True
+
+
+class _SQLiteCache:
+    """Minimal TTL key/value store on sqlite3, mirroring diskcache's get/set"""
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, expires REAL)'
+        )
+        # Sweep entries that expired since the last run so the store
+        # doesn't grow without bound across process lifetimes
+        self._conn.execute('DELETE FROM cache WHERE expires < ?', (time.time(),))
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value, expires FROM cache WHERE key = ?', (key,)
+            ).fetchone()
+            if row is not None and row[1] < time.time():
+                # Reap the stale row on read rather than leaving it for
+                # the next process start
+                self._conn.execute('DELETE FROM cache WHERE key = ?', (key,))
+                self._conn.commit()
+                row = None
+        if row is None:
+            return None
+        return row[0]
+
+    def set(self, key, value, expire):
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)',
+                (key, value, time.time() + expire)
+            )
+            self._conn.commit()
+
+
+def _get_store():
+    global _store
+    if _disabled:
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                try:
+                    if diskcache is not None:
+                        _store = diskcache.Cache(CACHE_DIR)
+                    else:
+                        _store = _SQLiteCache(os.path.join(CACHE_DIR, 'responses.sqlite3'))
+                except Exception as e:
+                    # An unwritable cache dir shouldn't break report generation
+                    print(f"[Cache] Disabled, could not open {CACHE_DIR}: {e}", file=sys.stderr)
+                    disable()
+    return _store
+
+
+def _key(endpoint, params):
+    payload = json.dumps([endpoint, params], sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode()).hexdigest()
+
+
+def cached_get(url, params, ttl, session=None, timeout=10):
+    """GET a JSON endpoint, serving repeat calls from the on-disk cache
+
+    Returns the parsed JSON body. `session` may be any client exposing a
+    requests-style .get() (a requests.Session or httpx.Client).
+    """
+    key = _key(url, params)
+    store = _get_store()
+    if store is not None:
+        body = store.get(key)
+        if body is not None:
+            return _loads(body)
+
+    client = session if session is not None else requests
+    response = client.get(url, params=params, timeout=timeout)
+    response.raise_for_status()
+    body = response.text
+
+    if store is not None:
+        store.set(key, body, expire=ttl)
+    # Parse from response.content when orjson is available (bytes in, C speed)
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return json.loads(body)
+
+
+def cached_data(client, dataset_key, ttl=SODA_TTL, **query):
+    """Wrap client.get_data with the on-disk cache, keyed by dataset + query"""
+    key = _key(dataset_key, query)
+    store = _get_store()
+    if store is not None:
+        body = store.get(key)
+        if body is not None:
+            return _loads(body)
+
+    rows = client.get_data(dataset_key, **query)
+
+    # get_data returns [] for failed fetches as well as empty results;
+    # caching it would pin a transient 429/timeout as "no violations"
+    # for the TTL, so empty responses are always re-fetched
+    if store is not None and rows:
+        if orjson is not None:
+            store.set(key, orjson.dumps(rows).decode(), expire=ttl)
+        else:
+            store.set(key, json.dumps(rows), expire=ttl)
+    return rows
+
+
+async def cached_data_async(client, dataset_key, ttl=SODA_TTL, **query):
+    """Async twin of cached_data, wrapping client.get_data_async
+
+    Keys are identical to cached_data's, so the sync and async transports
+    read and warm the same entries. Store lookups are local sqlite reads,
+    fast enough to run inline on the event loop.
+    """
+    key = _key(dataset_key, query)
+    store = _get_store()
+    if store is not None:
+        body = store.get(key)
+        if body is not None:
+            return _loads(body)
+
+    rows = await client.get_data_async(dataset_key, **query)
+
+    # Same rule as cached_data: an empty list may be a swallowed fetch
+    # error, so it is never persisted
+    if store is not None and rows:
+        if orjson is not None:
+            store.set(key, orjson.dumps(rows).decode(), expire=ttl)
+        else:
+            store.set(key, json.dumps(rows), expire=ttl)
+    return rows
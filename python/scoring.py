@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Shared NYC compliance scoring
+
+Both report CLIs previously carried their own copy of this function;
+one module means one implementation to maintain and one import to pay.
+"""
+
+
+def _count(counts, data, key):
+    """Exact total for a dataset: count(*) result, else the row list length
+
+    Looked up lazily so the common path (counts present) never touches or
+    allocates the fallback row lists.
+    """
+    n = counts.get(key)
+    if n is None:
+        rows = data.get(key)
+        n = len(rows) if rows else 0
+    return n
+
+
+def calculate_scores(data):
+    """Calculate compliance scores from fetched violation/device data
+
+    Row lists are capped server-side at what the report ships, so exact
+    totals come from the parallel count(*) queries in data['counts'] when
+    present, falling back to list lengths. max(0, 100 - 0 * weight) is
+    already 100, so no zero-count guard is needed - the formula is
+    branchless.
+    """
+    counts = data.get('counts') or {}
+    hpd_active = _count(counts, data, 'hpd_violations')
+    dob_active = _count(counts, data, 'dob_violations')
+
+    hpd_score = max(0, 100 - (hpd_active * 10))
+    dob_score = max(0, 100 - (dob_active * 15))
+    overall_score = (hpd_score * 0.5) + (dob_score * 0.5)
+
+    return {
+        'hpd_score': round(hpd_score, 1),
+        'dob_score': round(dob_score, 1),
+        'overall_score': round(overall_score, 1),
+        'hpd_violations_active': hpd_active,
+        'dob_violations_active': dob_active,
+        'elevator_devices': _count(counts, data, 'elevator_data'),
+        'boiler_devices': _count(counts, data, 'boiler_data'),
+        'electrical_permits': _count(counts, data, 'electrical_permits')
+    }
@@ -1,7 +1,14 @@
 #!/usr/bin/env python3
 """Test script for the consolidated compliance service"""
 
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
+# The enhanced Philly client lives at the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from philly import PhillyEnhancedDataClient
 from generate_philly_report import generate_philly_report
 from generate_report import get_property_identifiers, get_comprehensive_compliance_data, calculate_scores
 
@@ -36,6 +43,54 @@ def test_philadelphia():
         traceback.print_exc()
         return False
 
+def test_boiler_parsing():
+    """Test boiler permit parsing for a scope with no model field (offline)
+
+    Regression check: parse_boiler_device_info once returned None for any
+    scope whose first model pattern did not match, dropping every parsed
+    field.
+    """
+    print("\n" + "="*60)
+    print("Testing Boiler Permit Parsing")
+    print("="*60)
+
+    client = PhillyEnhancedDataClient()
+    permit = {
+        'permitnumber': 'TEST-001',
+        'approvedscopeofwork': 'INSTALL GAS FIRED STEAM BOILER IN BASEMENT'
+    }
+
+    try:
+        info = client.parse_boiler_device_info(permit)
+
+        if info is None:
+            print("❌ parse_boiler_device_info returned None for a model-less scope")
+            return False
+
+        checks = (
+            ('device_type', 'boiler'),
+            ('fuel_type', 'natural_gas'),
+            ('work_type', 'install'),
+            ('location', 'basement'),
+            ('model', None),
+        )
+        for field, expected in checks:
+            if info.get(field) != expected:
+                print(f"❌ {field}: expected {expected!r}, got {info.get(field)!r}")
+                return False
+
+        print("\n✅ Model-less scope parsed correctly:")
+        print(f"   Device: {info['device_type']}")
+        print(f"   Fuel: {info['fuel_type']}")
+        print(f"   Location: {info['location']}")
+        return True
+
+    except Exception as e:
+        print(f"❌ Exception: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return False
+
 def test_nyc():
     """Test NYC compliance report generation"""
     print("\n" + "="*60)
@@ -72,18 +127,25 @@ if __name__ == '__main__':
     print("\n🧪 Testing Consolidated Compliance Service")
     print("=" * 60)
 
-    # Test Philadelphia
-    philly_passed = test_philadelphia()
+    # The parsing check is offline and instant; run it first
+    parsing_passed = test_boiler_parsing()
 
-    # Test NYC
-    nyc_passed = test_nyc()
+    # Both city tests are I/O-bound calls to independent services, so
+    # running them concurrently halves the wall time; their progress
+    # output may interleave
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        philly_future = pool.submit(test_philadelphia)
+        nyc_future = pool.submit(test_nyc)
+        philly_passed = philly_future.result()
+        nyc_passed = nyc_future.result()
 
     # Summary
     print("\n" + "="*60)
     print("Test Summary")
     print("="*60)
+    print(f"Boiler Parsing: {'✅ PASSED' if parsing_passed else '❌ FAILED'}")
     print(f"Philadelphia: {'✅ PASSED' if philly_passed else '❌ FAILED'}")
     print(f"NYC: {'✅ PASSED' if nyc_passed else '❌ FAILED'}")
     print("="*60 + "\n")
 
-    sys.exit(0 if (philly_passed and nyc_passed) else 1)
+    sys.exit(0 if (parsing_passed and philly_passed and nyc_passed) else 1)
@@ -8,6 +8,8 @@ comprehensive vendor recommendations for compliance violations.
 """
 
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple
 import asyncio
 from datetime import datetime
@@ -16,16 +18,49 @@ import json
 from vendor_service import VendorService
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=logging.WARNING)
 logger = logging.getLogger(__name__)
 
+# Bounded fan-out for place-details lookups; Google Places has no batch
+# endpoint, so concurrent single fetches are the closest equivalent
+_DETAILS_POOL = ThreadPoolExecutor(max_workers=10)
+
+# One VendorService per process: its HTTP session pool, SQLite cache
+# connection and token buckets only work as intended when every request
+# shares them, and marketplaces are typically constructed per request
+_vendor_service = None
+_vendor_service_lock = threading.Lock()
+
+
+def _get_vendor_service() -> VendorService:
+    """Return the shared VendorService, creating it on first use"""
+    global _vendor_service
+    if _vendor_service is None:
+        with _vendor_service_lock:
+            if _vendor_service is None:
+                _vendor_service = VendorService()
+    return _vendor_service
+
 class VendorMarketplace:
     """Main vendor marketplace service"""
-    
+
+    # (violation_data key, threshold, contractor category): one rule per
+    # line, so adding a category is a data change rather than another
+    # if-block in _identify_needed_categories
+    _CATEGORY_RULES = (
+        ('hpd_violations_active', 0, 'hpd'),
+        ('dob_violations_active', 0, 'dob'),
+        ('elevator_devices_active', 0, 'elevator'),
+        ('boiler_devices_total', 0, 'boiler'),
+        ('electrical_permits_active', 0, 'electrical'),
+    )
+
+    # Any of these tripping also pulls in fire safety
+    _FIRE_SAFETY_KEYS = ('hpd_violations_active', 'dob_violations_active')
+
+
     def __init__(self):
         """Initialize vendor services"""
-        self.vendor_service = VendorService()
-        
         # Map violation categories to contractor types
         self.violation_to_category_map = {
             'hpd_violations': 'hpd',
@@ -34,24 +69,34 @@ class VendorMarketplace:
             'boiler_devices': 'boiler',
             'electrical_permits': 'electrical'
         }
-    
-    def get_vendors_for_property(self, 
+
+    @property
+    def vendor_service(self) -> VendorService:
+        """The process-wide VendorService, initialized lazily"""
+        return _get_vendor_service()
+
+    def get_vendors_for_property(self,
                                property_address: str,
                                violation_data: Dict,
-                               max_vendors_per_category: int = 5) -> Dict[str, List[Dict]]:
+                               max_vendors_per_category: int = 5,
+                               fetch_details: bool = False) -> Dict[str, List[Dict]]:
         """
         Get vendor recommendations based on property violations
-        
+
         Args:
             property_address: Property address for proximity search
             violation_data: Dictionary with violation counts by category
             max_vendors_per_category: Maximum vendors per category
-            
+            fetch_details: Also fetch full place details per vendor;
+                list views render fine from search results alone, so
+                this is off by default and detail pages should call
+                get_vendor_details_with_reviews on demand instead
+
         Returns:
             Dictionary mapping categories to vendor lists with reviews
         """
         try:
-            logger.info(f"Getting vendors for property: {property_address}")
+            logger.info("Getting vendors for property: %s", property_address)
             
             # Determine which categories need vendors based on violations
             categories_needed = self._identify_needed_categories(violation_data)
@@ -60,7 +105,7 @@ class VendorMarketplace:
                 logger.info("No violations found, providing general contractors")
                 categories_needed = ['hpd']  # Default to general contractors
             
-            logger.info(f"Categories needed: {categories_needed}")
+            logger.info("Categories needed: %s", categories_needed)
             
             # Get contractors for each category
             vendor_results = self.vendor_service.find_contractors_for_violations(
@@ -69,24 +114,44 @@ class VendorMarketplace:
                 max_per_category=max_vendors_per_category
             )
             
+            # Details are opt-in: when requested, fetch once per unique
+            # place_id concurrently — the same contractor often shows up
+            # in several categories, and serial per-vendor lookups were
+            # the slowest part of the page. Without them, vendors pass
+            # through as Basic and detail pages fetch on demand.
+            details_map = {}
+            if fetch_details:
+                unique_place_ids = {
+                    vendor['place_id']
+                    for vendors in vendor_results.values()
+                    for vendor in vendors
+                    if vendor.get('place_id')
+                }
+                detail_futures = {
+                    place_id: _DETAILS_POOL.submit(
+                        self.vendor_service.get_contractor_details, place_id)
+                    for place_id in unique_place_ids
+                }
+                details_map = {
+                    place_id: future.result()
+                    for place_id, future in detail_futures.items()
+                }
+
             # Enhanced results using only Google Places data (no Apify)
             enhanced_results = {}
-            
+
             for category, vendors in vendor_results.items():
-                enhanced_vendors = []
-                
-                for vendor in vendors:
-                    # Get enhanced details from Google Places API only
-                    enhanced_vendor = self._enhance_vendor_with_places_data(vendor)
-                    enhanced_vendors.append(enhanced_vendor)
-                
-                enhanced_results[category] = enhanced_vendors
-            
-            logger.info(f"Successfully retrieved vendors for {len(enhanced_results)} categories")
+                # Enhancement is now a pure dict merge from details_map
+                enhanced_results[category] = [
+                    self._enhance_vendor_with_places_data(vendor, details_map)
+                    for vendor in vendors
+                ]
+            
+            logger.info("Successfully retrieved vendors for %d categories", len(enhanced_results))
             return enhanced_results
             
         except Exception as e:
-            logger.error(f"Error getting vendors for property: {e}")
+            logger.error("Error getting vendors for property: %s", e)
             return {}
     
     def get_vendor_details_with_reviews(self, place_id: str) -> Optional[Dict]:
@@ -113,50 +178,35 @@ class VendorMarketplace:
             return contractor_details
             
         except Exception as e:
-            logger.error(f"Error getting vendor details for {place_id}: {e}")
+            logger.error("Error getting vendor details for %s: %s", place_id, e)
             return None
     
     def _identify_needed_categories(self, violation_data: Dict) -> List[str]:
         """Identify which contractor categories are needed based on violations"""
-        categories = []
-        
-        # Check HPD violations
-        if violation_data.get('hpd_violations_active', 0) > 0:
-            categories.append('hpd')
-        
-        # Check DOB violations
-        if violation_data.get('dob_violations_active', 0) > 0:
-            categories.append('dob')
-        
-        # Check elevator issues
-        if violation_data.get('elevator_devices_active', 0) > 0:
-            categories.append('elevator')
-        
-        # Check boiler issues (assume need maintenance if devices exist)
-        if violation_data.get('boiler_devices_total', 0) > 0:
-            categories.append('boiler')
-        
-        # Check electrical permits
-        if violation_data.get('electrical_permits_active', 0) > 0:
-            categories.append('electrical')
-        
+        categories = [
+            category
+            for key, threshold, category in self._CATEGORY_RULES
+            if violation_data.get(key, 0) > threshold
+        ]
+
         # Always include fire safety if there are any violations
-        if any(violation_data.get(key, 0) > 0 for key in ['hpd_violations_active', 'dob_violations_active']):
+        if any(violation_data.get(key, 0) > 0 for key in self._FIRE_SAFETY_KEYS):
             categories.append('fire_safety')
-        
+
         return categories
     
-    def _enhance_vendor_with_places_data(self, vendor: Dict) -> Dict:
-        """Enhance a vendor with Google Places data only"""
+    def _enhance_vendor_with_places_data(self, vendor: Dict,
+                                         details_map: Dict[str, Optional[Dict]]) -> Dict:
+        """Enhance a vendor from the pre-fetched place details map"""
         try:
-            # Get detailed vendor info from Google Places
+            # Look the vendor up in the batch-fetched details
             place_id = vendor.get('place_id')
             if not place_id:
                 vendor['reviews_enhanced'] = False
                 vendor['data_source'] = 'Basic'
                 return vendor
-            
-            detailed_info = self.vendor_service.get_contractor_details(place_id)
+
+            detailed_info = details_map.get(place_id)
             if not detailed_info:
                 vendor['reviews_enhanced'] = False
                 vendor['data_source'] = 'Basic'
@@ -174,31 +224,39 @@ class VendorMarketplace:
             return vendor
             
         except Exception as e:
-            logger.error(f"Error enhancing vendor with Places data: {e}")
+            logger.error("Error enhancing vendor with Places data: %s", e)
             vendor['reviews_enhanced'] = False
             vendor['data_source'] = 'Basic'
             return vendor
     
     def format_vendor_for_ui(self, vendor: Dict, category: str) -> Dict:
         """Format vendor data for UI display"""
+        # One merged view: enhanced ratings (set by the details merge)
+        # overlay the base fields, so each key is read exactly once
+        # instead of the old get-or-get pairs
+        overlay = {
+            'rating': vendor.get('enhanced_rating'),
+            'rating_count': vendor.get('enhanced_review_count'),
+        }
+        view = {**vendor, **{k: v for k, v in overlay.items() if v is not None}}
         return {
-            'place_id': vendor.get('place_id'),
-            'name': vendor.get('name'),
-            'address': vendor.get('address'),
-            'phone': vendor.get('phone'),
-            'website': vendor.get('website'),
-            'rating': vendor.get('enhanced_rating') or vendor.get('rating'),
-            'rating_count': vendor.get('enhanced_review_count') or vendor.get('rating_count'),
-            'distance_miles': vendor.get('distance_miles'),
-            'business_status': vendor.get('business_status'),
-            'opening_hours': vendor.get('opening_hours'),
-            'price_level': vendor.get('price_level'),
+            'place_id': view.get('place_id'),
+            'name': view.get('name'),
+            'address': view.get('address'),
+            'phone': view.get('phone'),
+            'website': view.get('website'),
+            'rating': view.get('rating'),
+            'rating_count': view.get('rating_count'),
+            'distance_miles': view.get('distance_miles'),
+            'business_status': view.get('business_status'),
+            'opening_hours': view.get('opening_hours'),
+            'price_level': view.get('price_level'),
             'category': category,
-            'search_term': vendor.get('search_term'),
-            'reviews_enhanced': vendor.get('reviews_enhanced', False),
-            'google_maps_url': vendor.get('google_maps_url'),
-            'photos': vendor.get('photos', []),
-            'google_reviews': vendor.get('reviews', [])
+            'search_term': view.get('search_term'),
+            'reviews_enhanced': view.get('reviews_enhanced', False),
+            'google_maps_url': view.get('google_maps_url'),
+            'photos': view.get('photos', []),
+            'google_reviews': view.get('reviews', [])
         }
 
 def test_vendor_marketplace():
@@ -225,7 +283,8 @@ def test_vendor_marketplace():
     vendors = marketplace.get_vendors_for_property(
         property_address=test_address,
         violation_data=test_violations,
-        max_vendors_per_category=3
+        max_vendors_per_category=3,
+        fetch_details=True
     )
     
     print(f"\nFound vendors for {len(vendors)} categories:")
@@ -240,8 +299,8 @@ def test_vendor_marketplace():
             print(f"     Rating: {formatted['rating'] or 'N/A'}/5 ({formatted['rating_count'] or 0} reviews)")
             print(f"     Distance: {formatted['distance_miles']} miles")
             print(f"     Reviews: {reviews_status}")
-            if formatted['common_keywords']:
-                print(f"     Keywords: {', '.join(formatted['common_keywords'][:3])}")
+            if formatted['google_reviews']:
+                print(f"     Review count: {len(formatted['google_reviews'])}")
     
     print("\n✅ Vendor marketplace test completed")
 